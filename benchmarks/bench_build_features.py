@@ -0,0 +1,80 @@
+"""Scaling benchmark for pipelines.build_features.
+
+Generates synthetic daily OHLCV files for a grid of universe sizes and
+history lengths, then times the in-process indicator step and the full
+file-to-panel build with one worker and with a process pool.
+
+    python -m benchmarks.bench_build_features --symbols 30 300 --years 4 20
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from pipelines.build_features import add_features, build_panel, read_raw
+
+
+def make_raw_files(directory, n_symbols, n_years, seed=0):
+    rng = np.random.default_rng(seed)
+    n_bars = n_years * 365
+    dates = pd.date_range("2000-01-01", periods=n_bars, freq="D")
+
+    for i in range(n_symbols):
+        symbol = f"SYN{i:04d}-USD"
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.04, n_bars)))
+        spread = np.abs(rng.normal(0, 0.01, n_bars)) * close
+        pd.DataFrame({
+            "Date": dates,
+            "Name": f"Synthetic {i}",
+            "Symbol": symbol,
+            "Open": close + rng.normal(0, 0.005, n_bars) * close,
+            "High": close + spread,
+            "Low": close - spread,
+            "Close": close,
+            "Volume": rng.integers(1_000, 1_000_000_000, n_bars),
+        }).to_csv(os.path.join(directory, f"{symbol}.csv"), index=False)
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, nargs="+", default=[30, 100, 300])
+    parser.add_argument("--years", type=int, nargs="+", default=[4, 10, 20])
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    print(
+        f"{'symbols':>8} {'years':>6} {'rows':>10} "
+        f"{'features_s':>11} {'build_1w_s':>11} {'build_' + str(args.workers) + 'w_s':>11} "
+        f"{'rows/s':>12}"
+    )
+
+    for n_symbols in args.symbols:
+        for n_years in args.years:
+            with tempfile.TemporaryDirectory() as directory:
+                make_raw_files(directory, n_symbols, n_years)
+
+                raw = read_raw(sorted(
+                    os.path.join(directory, name) for name in os.listdir(directory)
+                ))
+                _, features_s = timed(add_features, raw)
+                _, serial_s = timed(build_panel, directory, workers=1)
+                panel, parallel_s = timed(build_panel, directory, workers=args.workers)
+
+            print(
+                f"{n_symbols:>8} {n_years:>6} {len(panel):>10} "
+                f"{features_s:>11.3f} {serial_s:>11.3f} {parallel_s:>11.3f} "
+                f"{len(panel) / features_s:>12,.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
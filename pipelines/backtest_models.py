@@ -0,0 +1,185 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from pipelines.train_models import MODELS_DIR, limit_threads
+from services.backtest import score_predictions, walk_forward, walk_forward_folds
+from services.data_store import read_panel
+from services.forecasting import MODELS, training_series
+
+METRICS_FILE = "model_comparison_metrics.csv"
+FOLDS_FILE = "model_backtest_folds.csv"
+PREDICTIONS_FILE = "model_backtest_predictions.feather"
+
+MIN_TRAIN = 365
+HORIZON = 30
+FOLDS_PER_TASK = 4
+REFIT_EVERY = 6
+
+MODEL_NAMES = {prefix: name for name, prefix in MODELS.items()}
+
+_WORKER = {}
+
+
+def _init_worker(threads):
+    limit_threads(threads)
+    _WORKER["panel"] = read_panel()
+
+
+def _run_task(task):
+    prefix, symbol, folds, first_fold, refit_every = task
+    panel = _WORKER["panel"]
+    close = training_series(panel[panel["Symbol"] == symbol])
+
+    started = time.perf_counter()
+    predictions = walk_forward(close, prefix, folds, first_fold, refit_every=refit_every)
+    predictions.insert(0, "Coin", symbol)
+    predictions.insert(0, "Model", MODEL_NAMES[prefix])
+    return predictions, time.perf_counter() - started
+
+
+def build_tasks(panel, symbols, models, min_train=MIN_TRAIN, horizon=HORIZON, step=None,
+                window=None, folds_per_task=FOLDS_PER_TASK, refit_every=REFIT_EVERY):
+    """Split each coin/model walk into runs of consecutive folds.
+
+    Folds inside a task share one model that is updated from fold to fold;
+    separate tasks start from a fresh fit, so they can run in parallel.
+    """
+    tasks = []
+    for symbol in symbols:
+        n_obs = len(training_series(panel[panel["Symbol"] == symbol]))
+        folds = walk_forward_folds(n_obs, min_train, horizon, step, window)
+        for prefix in models:
+            for first in range(0, len(folds), folds_per_task):
+                tasks.append((
+                    prefix, symbol, folds[first:first + folds_per_task], first, refit_every
+                ))
+    return tasks
+
+
+def run_backtest(tasks, workers=None, threads_per_task=1):
+    """Run every task and return (predictions, {(model, coin): error})."""
+    workers = min(workers or os.cpu_count() or 1, len(tasks) or 1)
+    frames, failures = [], {}
+
+    def collect(task, run):
+        try:
+            predictions, seconds = run()
+        except Exception as exc:
+            failures[task[0], task[1]] = f"{type(exc).__name__}: {exc}"
+            return
+        frames.append(predictions)
+        print(f"{seconds:8.1f}s  {task[0]}/{task[1]} folds {task[3]}+{len(task[2])}", flush=True)
+
+    if workers == 1:
+        _init_worker(threads_per_task)
+        for task in tasks:
+            collect(task, lambda task=task: _run_task(task))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(threads_per_task,),
+        ) as pool:
+            futures = {pool.submit(_run_task, task): task for task in tasks}
+            for future in as_completed(futures):
+                collect(futures[future], future.result)
+
+    if not frames:
+        return pd.DataFrame(), failures
+    # Tasks finish in any order; callers rely on each walk being chronological.
+    predictions = pd.concat(frames, ignore_index=True).sort_values(
+        ["Model", "Coin", "Fold", "Date"], kind="stable", ignore_index=True
+    )
+    return predictions, failures
+
+
+def _merge_existing(new, path, read=pd.read_csv):
+    """Keep rows of model/coin pairs that this run did not score."""
+    if not os.path.exists(path):
+        return new
+    old = read(path)
+    scored = pd.MultiIndex.from_frame(new[["Model", "Coin"]].drop_duplicates())
+    keep = ~pd.MultiIndex.from_frame(old[["Model", "Coin"]]).isin(scored)
+    return pd.concat([old[keep], new], ignore_index=True).sort_values(["Model", "Coin"], kind="stable")
+
+
+def write_metrics(per_fold, aggregate, models_dir=MODELS_DIR):
+    rounding = {"MAE": 4, "RMSE": 4, "MAPE": 2, "Direction_Accuracy": 2}
+    for df, name in ((aggregate, METRICS_FILE), (per_fold, FOLDS_FILE)):
+        path = os.path.join(models_dir, name)
+        df = _merge_existing(df.round(rounding), path)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        df.to_csv(tmp_path, index=False, date_format="%Y-%m-%d")
+        os.replace(tmp_path, path)
+
+
+def write_predictions(predictions, models_dir=MODELS_DIR):
+    """Out-of-sample predictions, kept for the forecast interval engine and
+    the signal backtester."""
+    path = os.path.join(models_dir, PREDICTIONS_FILE)
+    columns = ["Model", "Coin", "Fold", "Date", "Actual", "Predicted", "Forecast"]
+    df = _merge_existing(predictions[columns], path, pd.read_feather).sort_values(
+        ["Model", "Coin", "Date"], kind="stable"
+    )
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    df.reset_index(drop=True).to_feather(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Walk-forward backtest of every forecasting model and coin."
+    )
+    parser.add_argument("--models-dir", default=MODELS_DIR)
+    parser.add_argument("--symbols", nargs="*", default=None)
+    parser.add_argument("--models", nargs="*", default=None, choices=list(MODELS.values()))
+    parser.add_argument("--min-train", type=int, default=MIN_TRAIN)
+    parser.add_argument("--horizon", type=int, default=HORIZON)
+    parser.add_argument("--step", type=int, default=None)
+    parser.add_argument(
+        "--window", type=int, default=None,
+        help="Rolling training window in bars; expanding when omitted."
+    )
+    parser.add_argument("--folds-per-task", type=int, default=FOLDS_PER_TASK)
+    parser.add_argument(
+        "--refit-every", type=int, default=REFIT_EVERY,
+        help="Full refit every N folds; in between models are updated incrementally."
+    )
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--threads-per-task", type=int, default=1)
+    args = parser.parse_args()
+
+    panel = read_panel()
+    tasks = build_tasks(
+        panel,
+        args.symbols or sorted(panel["Symbol"].unique()),
+        args.models or list(MODELS.values()),
+        args.min_train, args.horizon, args.step, args.window,
+        args.folds_per_task, args.refit_every,
+    )
+
+    started = time.perf_counter()
+    predictions, failures = run_backtest(tasks, args.workers, args.threads_per_task)
+    for (prefix, symbol), error in failures.items():
+        print(f"failed  {prefix}/{symbol}: {error}")
+
+    if predictions.empty:
+        print("No model produced predictions; metrics left unchanged.")
+        return
+
+    per_fold, aggregate = score_predictions(predictions)
+    os.makedirs(args.models_dir, exist_ok=True)
+    write_metrics(per_fold, aggregate, args.models_dir)
+    write_predictions(predictions, args.models_dir)
+    print(
+        f"\nScored {len(aggregate)} model/coin pairs over {len(per_fold)} folds "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
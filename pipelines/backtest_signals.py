@@ -0,0 +1,55 @@
+import argparse
+import os
+import time
+
+import pandas as pd
+
+from pipelines.backtest_models import PREDICTIONS_FILE
+from pipelines.train_models import MODELS_DIR
+from services.data_store import read_panel
+from services.signal_backtest import backtest_signals
+from services.trading_signals import SIGNAL_THRESHOLD
+
+RESULTS_FILE = "signal_backtest_metrics.csv"
+HORIZONS = (7, 14, 30)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replay the models' historical trading signals over a grid of "
+                    "fees, slippage and position sizes."
+    )
+    parser.add_argument("--models-dir", default=MODELS_DIR)
+    parser.add_argument("--horizons", type=int, nargs="*", default=list(HORIZONS))
+    parser.add_argument("--fees", type=float, nargs="*", default=[0.0, 0.001, 0.0025])
+    parser.add_argument("--slippage", type=float, nargs="*", default=[0.0, 0.0005, 0.001])
+    parser.add_argument("--sizes", type=float, nargs="*", default=[0.25, 0.5, 1.0])
+    parser.add_argument("--threshold", type=float, default=SIGNAL_THRESHOLD)
+    parser.add_argument("--allow-short", action="store_true")
+    args = parser.parse_args()
+
+    predictions_path = os.path.join(args.models_dir, PREDICTIONS_FILE)
+    if not os.path.exists(predictions_path):
+        print(f"Missing {predictions_path}; run pipelines.backtest_models first.")
+        return
+    predictions = pd.read_feather(predictions_path)
+    if "Forecast" not in predictions:
+        print("Backtest predictions have no Forecast paths; rerun pipelines.backtest_models.")
+        return
+
+    started = time.perf_counter()
+    closes = read_panel().pivot(columns="Symbol", values="Close")
+    results = backtest_signals(
+        predictions.dropna(subset=["Forecast"]), closes, args.horizons,
+        args.fees, args.slippage, args.sizes, args.threshold, args.allow_short,
+    )
+
+    path = os.path.join(args.models_dir, RESULTS_FILE)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    results.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    print(f"Wrote {len(results)} rows in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
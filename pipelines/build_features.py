@@ -0,0 +1,209 @@
+import argparse
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+RAW_DIR = os.path.join("dataset", "30_cryptosets")
+OUTPUT_PATH = os.path.join("dataset", "main_crypto_dataset.csv")
+
+RAW_COLUMNS = ["Date", "Name", "Symbol", "Open", "High", "Low", "Close", "Volume"]
+
+SMA_WINDOWS = (7, 14)
+EMA_SPANS = (7, 14)
+VOLATILITY_WINDOWS = (7, 14)
+
+FEATURE_COLUMNS = (
+    [f"SMA_{w}" for w in SMA_WINDOWS]
+    + [f"EMA_{s}" for s in EMA_SPANS]
+    + ["Daily_Return", "Log_Return"]
+    + [f"Volatility_{w}" for w in VOLATILITY_WINDOWS]
+)
+PANEL_COLUMNS = RAW_COLUMNS + FEATURE_COLUMNS
+
+
+# The kernels below work on 2-D (bar x coin) arrays, one column per coin,
+# with each coin's history starting at row 0 and NaN padding after its last
+# bar. Window sums are accumulated lag by lag rather than with a running
+# sum, so a row's value depends only on the bars in its window and is
+# bit-for-bit the same however many rows are computed at once.
+
+def _window_sum(values, window):
+    out = np.full_like(values, np.nan)
+    n_rows = len(values) - window + 1
+    if n_rows <= 0:
+        return out
+
+    total = values[:n_rows].copy()
+    for lag in range(1, window):
+        total += values[lag:lag + n_rows]
+
+    out[window - 1:] = total
+    return out
+
+
+def rolling_mean(values, window):
+    return _window_sum(values, window) / window
+
+
+def rolling_std(values, window):
+    """Sample (ddof=1) standard deviation over a trailing window."""
+    out = np.full_like(values, np.nan)
+    n_rows = len(values) - window + 1
+    if n_rows <= 0:
+        return out
+
+    mean = _window_sum(values, window)[window - 1:] / window
+    squares = (values[:n_rows] - mean) ** 2
+    for lag in range(1, window):
+        squares += (values[lag:lag + n_rows] - mean) ** 2
+
+    out[window - 1:] = np.sqrt(squares / (window - 1))
+    return out
+
+
+def ema(values, span, seed=None):
+    """Exponential moving average with ``adjust=False`` semantics.
+
+    ``seed`` holds the EMA of the bar before ``values[0]`` for each column;
+    columns without one (NaN, or no seed at all) start at their first value.
+    """
+    alpha = 2.0 / (span + 1)
+    out = np.empty_like(values)
+    if len(values) == 0:
+        return out
+
+    if seed is None:
+        out[0] = values[0]
+    else:
+        out[0] = np.where(
+            np.isnan(seed), values[0], alpha * values[0] + (1 - alpha) * seed
+        )
+
+    for i in range(1, len(values)):
+        out[i] = alpha * values[i] + (1 - alpha) * out[i - 1]
+    return out
+
+
+def simple_returns(close):
+    out = np.full_like(close, np.nan)
+    out[1:] = close[1:] / close[:-1] - 1
+    return out
+
+
+def log_returns(close):
+    out = np.full_like(close, np.nan)
+    out[1:] = np.log(close[1:] / close[:-1])
+    return out
+
+
+# Bars of history a new bar's window features can reach back to: SMA_14
+# needs 13 earlier closes, Volatility_14 needs 13 earlier returns and so 14
+# earlier closes.
+CONTEXT_BARS = max(max(SMA_WINDOWS) - 1, max(VOLATILITY_WINDOWS))
+
+
+def indicator_block(close, context=0, ema_seeds=None):
+    """Compute every feature column for a (bar x coin) close array.
+
+    The first ``context`` rows are history that only feeds the windows of
+    later rows; results are returned for the rows after it. ``ema_seeds``
+    maps each EMA span to the per-coin EMA of the last context bar.
+    """
+    ema_seeds = ema_seeds or {}
+    daily_return = simple_returns(close)
+
+    block = {}
+    for window in SMA_WINDOWS:
+        block[f"SMA_{window}"] = rolling_mean(close, window)[context:]
+    for span in EMA_SPANS:
+        block[f"EMA_{span}"] = ema(close[context:], span, ema_seeds.get(span))
+    block["Daily_Return"] = daily_return[context:]
+    block["Log_Return"] = log_returns(close)[context:]
+    for window in VOLATILITY_WINDOWS:
+        block[f"Volatility_{window}"] = rolling_std(daily_return, window)[context:]
+    return block
+
+
+def add_features(raw):
+    """Append the indicator columns to a long-form OHLCV frame.
+
+    ``raw`` must be sorted by Symbol then Date. Rows are scattered into a
+    (bar x coin) array by their position within each Symbol group, every
+    indicator is computed for all coins at once, and the results are
+    gathered back into the original row order.
+    """
+    codes, symbols = pd.factorize(raw["Symbol"])
+    position = raw.groupby("Symbol", sort=False).cumcount().to_numpy()
+
+    close = np.full((position.max() + 1, len(symbols)), np.nan)
+    close[position, codes] = raw["Close"].to_numpy(dtype="float64")
+
+    out = raw.copy()
+    for name, values in indicator_block(close).items():
+        out[name] = values[position, codes]
+    return out
+
+
+def read_raw(paths):
+    # round_trip parsing makes a float read back from the panel identical to
+    # the one written, which the incremental updater relies on.
+    frames = [
+        pd.read_csv(path, parse_dates=["Date"], float_precision="round_trip")
+        for path in paths
+    ]
+    raw = pd.concat(frames, ignore_index=True)
+    return raw.sort_values(["Symbol", "Date"], kind="stable", ignore_index=True)
+
+
+def _build_chunk(paths):
+    return add_features(read_raw(paths))[PANEL_COLUMNS]
+
+
+def sort_panel(panel):
+    # Date-major order means a new day's rows always go at the end of the
+    # file, which is what lets update_features append instead of rewrite.
+    return panel.sort_values(["Date", "Symbol"], kind="stable", ignore_index=True)
+
+
+def write_panel(panel, path=OUTPUT_PATH):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    panel.to_csv(tmp_path, index=False, lineterminator="\n")
+    os.replace(tmp_path, path)
+
+
+def build_panel(raw_dir=RAW_DIR, workers=None):
+    paths = sorted(glob.glob(os.path.join(raw_dir, "*.csv")))
+    if not paths:
+        raise FileNotFoundError(f"No CSV files found in {raw_dir}")
+
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    chunks = [paths[i::workers] for i in range(workers)]
+
+    if workers == 1:
+        parts = [_build_chunk(paths)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_build_chunk, chunks))
+
+    return sort_panel(pd.concat(parts, ignore_index=True))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build main_crypto_dataset.csv from the per-coin OHLCV files."
+    )
+    parser.add_argument("--raw-dir", default=RAW_DIR)
+    parser.add_argument("--output", default=OUTPUT_PATH)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    panel = build_panel(args.raw_dir, args.workers)
+    write_panel(panel, args.output)
+    print(f"Wrote {len(panel)} rows for {panel['Symbol'].nunique()} coins to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
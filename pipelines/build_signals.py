@@ -0,0 +1,64 @@
+import argparse
+import glob
+import os
+import time
+
+import pandas as pd
+
+from pipelines.train_models import MODELS_DIR
+from services.data_store import read_panel
+from services.forecasting import MODELS
+from services.trading_signals import HORIZONS, generate_signals
+
+SIGNALS_FILE = "trading_signals.csv"
+FORECAST_SUFFIX = "_3_month_forecast.csv"
+
+
+def load_forecast_paths(models_dir=MODELS_DIR):
+    """One row per (coin, model) forecast file: Symbol, Model, day 1..N."""
+    names = {prefix: name for name, prefix in MODELS.items()}
+    rows = []
+    for path in sorted(glob.glob(os.path.join(models_dir, f"*{FORECAST_SUFFIX}"))):
+        prefix, symbol = os.path.basename(path)[:-len(FORECAST_SUFFIX)].split("_", 1)
+        if prefix not in names:
+            continue
+        values = pd.read_csv(path).iloc[:, 1].to_numpy()
+        rows.append([symbol, names[prefix], *values])
+
+    if not rows:
+        return pd.DataFrame(columns=["Symbol", "Model"])
+    width = max(len(row) for row in rows)
+    return pd.DataFrame(
+        [row + [float("nan")] * (width - len(row)) for row in rows],
+        columns=["Symbol", "Model"] + list(range(1, width - 1)),
+    )
+
+
+def latest_features(panel):
+    return panel.groupby("Symbol", observed=True)[["Close", "SMA_7", "SMA_14"]].last()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build trading_signals.csv from every saved forecast."
+    )
+    parser.add_argument("--models-dir", default=MODELS_DIR)
+    parser.add_argument("--horizons", type=int, nargs="*", default=list(HORIZONS))
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    forecasts = load_forecast_paths(args.models_dir)
+    signals = generate_signals(forecasts, latest_features(read_panel()), args.horizons)
+
+    path = os.path.join(args.models_dir, SIGNALS_FILE)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    signals.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    print(
+        f"Wrote {len(signals)} signals for {signals['Symbol'].nunique()} coins "
+        f"in {time.perf_counter() - started:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.decomposition import PCA
+from sklearn.preprocessing import StandardScaler
+
+from services.data_store import read_panel
+
+OUTPUT_DIR = "dataset"
+PCA_FILE = "pca_components.csv"
+CLUSTER_FILE = "clustered_coins.csv"
+REPRESENTATIVE_FILE = "cluster_representatives.csv"
+CENTROID_FILE = "cluster_centroids.csv"
+
+N_CLUSTERS = 4
+N_COMPONENTS = 2
+BATCH_SIZE = 1024
+
+
+def _column_moments(values):
+    """NaN-aware mean, std, skew and excess kurtosis of each column."""
+    present = ~np.isnan(values)
+    n = present.sum(axis=0).astype("float64")
+    mean = np.where(present, values, 0.0).sum(axis=0) / n
+    dev = np.where(present, values - mean, 0.0)
+    m2 = (dev ** 2).sum(axis=0) / n
+    m3 = (dev ** 3).sum(axis=0) / n
+    m4 = (dev ** 4).sum(axis=0) / n
+    with np.errstate(invalid="ignore", divide="ignore"):
+        std = np.sqrt(m2 * n / (n - 1))
+        skew = m3 / m2 ** 1.5
+        kurt = m4 / m2 ** 2 - 3
+    return mean, std, skew, kurt
+
+
+def extract_features(panel):
+    """Per-coin behaviour features, computed for all coins at once.
+
+    Each input column is pivoted to a (date x coin) matrix and reduced
+    along the date axis, so there is no per-coin loop.
+    """
+    returns = panel.pivot(columns="Symbol", values="Daily_Return")
+    symbols = [str(s) for s in returns.columns]
+    close = panel.pivot(columns="Symbol", values="Close")[returns.columns].to_numpy()
+    volume = panel.pivot(columns="Symbol", values="Volume")[returns.columns].to_numpy()
+    volatility = panel.pivot(columns="Symbol", values="Volatility_14")[returns.columns].to_numpy()
+
+    mean, std, skew, kurt = _column_moments(returns.to_numpy())
+
+    running_peak = np.fmax.accumulate(close, axis=0)
+    with np.errstate(invalid="ignore"):
+        drawdown = np.nanmin(close / running_peak - 1, axis=0)
+
+    present = ~np.isnan(close)
+    first = close[present.argmax(axis=0), np.arange(close.shape[1])]
+    last = close[len(close) - 1 - present[::-1].argmax(axis=0), np.arange(close.shape[1])]
+    trend = np.log(last / first) / present.sum(axis=0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_volume = np.nanmean(np.log1p(volume), axis=0)
+
+    return pd.DataFrame({
+        "Mean_Return": mean,
+        "Return_Volatility": std,
+        "Return_Skew": skew,
+        "Return_Kurtosis": kurt,
+        "Mean_Volatility_14": np.nanmean(volatility, axis=0),
+        "Max_Drawdown": drawdown,
+        "Trend": trend,
+        "Mean_Log_Volume": log_volume,
+    }, index=pd.Index(symbols, name="Symbol"))
+
+
+def make_kmeans(n_samples, n_clusters, init="k-means++", n_init=10, seed=42):
+    """K-Means for ``n_samples`` points.
+
+    Universes larger than one batch use mini-batch K-Means; smaller ones
+    fit in a single batch anyway, where plain Lloyd iterations are exact
+    and deterministic.
+    """
+    if n_samples > BATCH_SIZE:
+        return MiniBatchKMeans(
+            n_clusters=n_clusters,
+            init=init,
+            n_init=n_init,
+            batch_size=BATCH_SIZE,
+            # Random re-seeding of small clusters would undo a warm start.
+            reassignment_ratio=0.0 if n_init == 1 else 0.01,
+            random_state=seed,
+        )
+    return KMeans(n_clusters=n_clusters, init=init, n_init=n_init, random_state=seed)
+
+
+def project_features(features, seed=42):
+    """Fill gaps, standardise and project onto the leading PCA components.
+
+    Returns the cleaned features, the fitted PCA and the projected matrix.
+    """
+    features = features.replace([np.inf, -np.inf], np.nan)
+    features = features.fillna(features.median())
+
+    scaled = StandardScaler().fit_transform(features.to_numpy())
+
+    pca = PCA(n_components=min(N_COMPONENTS, scaled.shape[1]), random_state=seed)
+    return features, pca, pca.fit_transform(scaled)
+
+
+def cluster_coins(features, n_clusters=N_CLUSTERS, previous_centroids=None, seed=42):
+    """Standardise, project with PCA and run K-Means.
+
+    ``previous_centroids`` are earlier centroids in standardised feature
+    space (as written to cluster_centroids.csv). They are projected into
+    the new PCA basis and used as the initial centres with a single init,
+    which keeps cluster ids stable between runs and converges in a few
+    iterations. Returns (pca_df, representatives_df, centroids_df).
+    """
+    features, pca, projected = project_features(features, seed)
+
+    if previous_centroids is not None and len(previous_centroids) == n_clusters:
+        init = pca.transform(previous_centroids[list(features.columns)].to_numpy())
+        n_init = 1
+    else:
+        init = "k-means++"
+        n_init = 10
+
+    kmeans = make_kmeans(len(projected), n_clusters, init, n_init, seed)
+    labels = kmeans.fit_predict(projected)
+
+    distances = np.linalg.norm(projected - kmeans.cluster_centers_[labels], axis=1)
+
+    components = [f"PC{i + 1}" for i in range(projected.shape[1])]
+    pca_df = pd.DataFrame(projected, columns=components)
+    pca_df.insert(0, "Symbol", features.index)
+    pca_df["Cluster"] = labels
+    pca_df["Distance"] = distances
+
+    representatives = (
+        pca_df.sort_values(["Cluster", "Distance"])
+        .groupby("Cluster", as_index=False)
+        .first()[["Cluster", "Symbol"]]
+        .rename(columns={"Symbol": "Selected_Coin"})
+    )
+
+    centroids = pd.DataFrame(
+        pca.inverse_transform(kmeans.cluster_centers_), columns=features.columns
+    )
+    centroids.insert(0, "Cluster", np.arange(n_clusters))
+
+    return pca_df.drop(columns="Distance"), representatives, centroids
+
+
+def _write_csv(df, path):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def run(panel, output_dir=OUTPUT_DIR, n_clusters=N_CLUSTERS, warm_start=True):
+    centroid_path = os.path.join(output_dir, CENTROID_FILE)
+    previous = None
+    if warm_start and os.path.exists(centroid_path):
+        previous = pd.read_csv(centroid_path)
+
+    pca_df, representatives, centroids = cluster_coins(
+        extract_features(panel), n_clusters, previous
+    )
+
+    _write_csv(pca_df, os.path.join(output_dir, PCA_FILE))
+    _write_csv(pca_df[["Symbol", "Cluster"]], os.path.join(output_dir, CLUSTER_FILE))
+    _write_csv(representatives, os.path.join(output_dir, REPRESENTATIVE_FILE))
+    _write_csv(centroids, centroid_path)
+
+    return pca_df, representatives
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Recompute PCA components, clusters and representative coins."
+    )
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    parser.add_argument("--clusters", type=int, default=N_CLUSTERS)
+    parser.add_argument(
+        "--cold", action="store_true",
+        help="Ignore saved centroids and re-initialise with k-means++."
+    )
+    args = parser.parse_args()
+
+    _, representatives = run(
+        read_panel(), args.output_dir, args.clusters, warm_start=not args.cold
+    )
+    print(representatives.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import adjusted_rand_score, silhouette_score
+
+from pipelines.cluster_coins import extract_features, make_kmeans, project_features
+from services.cluster_sweep import SWEEP_PATH, summarise_sweep
+from services.data_store import read_panel
+
+K_RANGE = range(2, 11)
+SEEDS = (0, 1, 2, 3, 4)
+N_BOOTSTRAP = 20
+SILHOUETTE_SAMPLE = 2000
+
+# Per-process view of the shared feature matrix, set by _attach.
+_SHARED = {}
+
+
+def _attach(name, shape, dtype):
+    block = shared_memory.SharedMemory(name=name)
+    _SHARED["block"] = block
+    _SHARED["matrix"] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+def _evaluate(task):
+    """Inertia, silhouette and bootstrap stability of one (k, seed) run.
+
+    Stability is the mean adjusted Rand index between the full-data
+    labels and the labels each bootstrap fit assigns to every point.
+    """
+    k, seed, n_bootstrap = task
+    matrix = _SHARED["matrix"]
+    n = len(matrix)
+
+    kmeans = make_kmeans(n, k, seed=seed)
+    labels = kmeans.fit_predict(matrix)
+
+    if len(np.unique(labels)) > 1:
+        silhouette = silhouette_score(
+            matrix, labels,
+            sample_size=min(n, SILHOUETTE_SAMPLE), random_state=seed,
+        )
+    else:
+        silhouette = np.nan
+
+    rng = np.random.default_rng(seed)
+    scores = np.empty(n_bootstrap)
+    for b in range(n_bootstrap):
+        sample = matrix[rng.integers(0, n, n)]
+        boot = make_kmeans(n, k, n_init=1, seed=seed * n_bootstrap + b).fit(sample)
+        scores[b] = adjusted_rand_score(labels, boot.predict(matrix))
+
+    return {
+        "K": k,
+        "Seed": seed,
+        "Inertia": float(kmeans.inertia_),
+        "Silhouette": float(silhouette),
+        "Stability": float(scores.mean()) if n_bootstrap else np.nan,
+    }
+
+
+def run_sweep(matrix, k_values=K_RANGE, seeds=SEEDS, n_bootstrap=N_BOOTSTRAP, workers=None):
+    """Evaluate every (k, seed) pair, one task per pool job.
+
+    ``matrix`` is copied once into a shared-memory block that each worker
+    maps at start-up, so tasks only carry (k, seed) rather than the data.
+    """
+    matrix = np.ascontiguousarray(matrix, dtype="float64")
+    k_values = [k for k in k_values if 1 < k < len(matrix)]
+    tasks = [(k, seed, n_bootstrap) for k in k_values for seed in seeds]
+    workers = min(workers or os.cpu_count() or 1, len(tasks) or 1)
+
+    block = shared_memory.SharedMemory(create=True, size=max(matrix.nbytes, 1))
+    try:
+        np.ndarray(matrix.shape, dtype=matrix.dtype, buffer=block.buf)[:] = matrix
+        init_args = (block.name, matrix.shape, matrix.dtype)
+
+        if workers == 1:
+            _attach(*init_args)
+            rows = [_evaluate(task) for task in tasks]
+            _SHARED.clear()
+        else:
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_attach, initargs=init_args
+            ) as pool:
+                rows = list(pool.map(_evaluate, tasks))
+    finally:
+        block.close()
+        block.unlink()
+
+    return pd.DataFrame(rows, columns=["K", "Seed", "Inertia", "Silhouette", "Stability"])
+
+
+def _fingerprint(matrix, k_values, seeds, n_bootstrap):
+    digest = hashlib.sha256(np.ascontiguousarray(matrix, dtype="float64").tobytes())
+    digest.update(json.dumps([list(k_values), list(seeds), n_bootstrap]).encode())
+    return digest.hexdigest()
+
+
+def load_or_run_sweep(matrix, path=SWEEP_PATH, k_values=K_RANGE, seeds=SEEDS,
+                      n_bootstrap=N_BOOTSTRAP, workers=None):
+    """Read the cached sweep, re-running it only if the inputs changed."""
+    fingerprint = _fingerprint(matrix, k_values, seeds, n_bootstrap)
+    meta_path = os.path.splitext(path)[0] + ".json"
+
+    if os.path.exists(path) and os.path.exists(meta_path):
+        with open(meta_path) as fh:
+            meta = json.load(fh)
+        if meta.get("features_sha256") == fingerprint:
+            return pd.read_csv(path)
+
+    results = run_sweep(matrix, k_values, seeds, n_bootstrap, workers)
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    results.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    with open(meta_path, "w") as fh:
+        json.dump({"features_sha256": fingerprint}, fh)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Sweep the number of clusters and seeds for the coin clustering."
+    )
+    parser.add_argument("--output", default=SWEEP_PATH)
+    parser.add_argument("--k-min", type=int, default=K_RANGE.start)
+    parser.add_argument("--k-max", type=int, default=K_RANGE.stop - 1)
+    parser.add_argument("--seeds", type=int, default=len(SEEDS))
+    parser.add_argument("--bootstrap", type=int, default=N_BOOTSTRAP)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    _, _, projected = project_features(extract_features(read_panel()))
+    results = load_or_run_sweep(
+        projected,
+        args.output,
+        range(args.k_min, args.k_max + 1),
+        tuple(range(args.seeds)),
+        args.bootstrap,
+        args.workers,
+    )
+    print(summarise_sweep(results).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
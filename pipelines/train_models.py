@@ -0,0 +1,289 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from services.data_store import read_panel
+from services.forecasting import (
+    DEFAULT_PARAMS,
+    FORECAST_CACHE_DIR,
+    MODELS,
+    BATCH_PARAMS,
+    cache_key,
+    get_forecast,
+    get_forecast_batch,
+    set_thread_limit,
+    training_series,
+)
+
+MODELS_DIR = os.path.join("dataset", "models")
+MANIFEST_FILE = "training_manifest.json"
+
+# Rough relative cost of one fit, used to start the slowest tasks first
+# when there is no earlier manifest to take timings from.
+COST_HINTS = {"lstm": 8, "prophet": 4, "xgb": 2, "rf": 2, "arima": 1}
+
+_THREAD_ENV = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+    "TF_NUM_INTRAOP_THREADS",
+    "TF_NUM_INTEROP_THREADS",
+)
+
+_WORKER = {}
+
+
+def output_paths(models_dir, prefix, symbol):
+    return (
+        os.path.join(models_dir, f"{prefix}_{symbol}_predicted.csv"),
+        os.path.join(models_dir, f"{prefix}_{symbol}_3_month_forecast.csv"),
+    )
+
+
+def limit_threads(threads):
+    """Cap every thread pool a fit can start in this process.
+
+    The environment variables are read by OpenMP, BLAS and TensorFlow when
+    they are first imported, which happens inside the fitters, after this
+    runs in the worker initializer.
+    """
+    for name in _THREAD_ENV:
+        os.environ[name] = str(threads)
+    set_thread_limit(threads)
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        return
+    _WORKER["threadpool_limits"] = threadpool_limits(threads)
+
+
+def _init_worker(threads, cache_dir, models_dir):
+    limit_threads(threads)
+    _WORKER["panel"] = read_panel()
+    _WORKER["cache_dir"] = cache_dir
+    _WORKER["models_dir"] = models_dir
+
+
+def _write_csv(df, path):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def _write_outputs(prefix, symbol, predicted, forecast):
+    predicted_path, forecast_path = output_paths(_WORKER["models_dir"], prefix, symbol)
+    predicted["Date"] = predicted["Date"].dt.strftime("%Y-%m-%d")
+    forecast["Date"] = forecast["Date"].dt.strftime("%Y-%m-%d")
+    _write_csv(predicted, predicted_path)
+    _write_csv(forecast, forecast_path)
+
+
+def _train(task):
+    """Fit one coin, or a tuple of coins with one pooled batch model."""
+    prefix, symbols, batch_mode = task
+    panel = _WORKER["panel"]
+    started = time.perf_counter()
+
+    try:
+        if batch_mode:
+            closes = {
+                symbol: training_series(panel[panel["Symbol"] == symbol])
+                for symbol in symbols
+            }
+            outputs = get_forecast_batch(
+                prefix, closes, mode=batch_mode, cache_dir=_WORKER["cache_dir"]
+            )
+        else:
+            close = training_series(panel[panel["Symbol"] == symbols])
+            outputs = {
+                symbols: get_forecast(symbols, prefix, close, cache_dir=_WORKER["cache_dir"])
+            }
+    except Exception as exc:
+        return {
+            "status": "failed",
+            "seconds": time.perf_counter() - started,
+            "error": f"{type(exc).__name__}: {exc}",
+        }
+
+    for symbol, (predicted, forecast) in outputs.items():
+        _write_outputs(prefix, symbol, predicted, forecast)
+
+    return {"status": "done", "seconds": time.perf_counter() - started}
+
+
+def load_manifest(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as fh:
+        return json.load(fh)
+
+
+def _save_manifest(manifest, path):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as fh:
+        json.dump(manifest, fh, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _is_current(entry, key, batch_mode, models_dir, prefix, symbol):
+    return (
+        entry is not None
+        and entry.get("status") == "done"
+        and entry.get("cache_key") == key
+        and entry.get("batch") == batch_mode
+        and all(os.path.exists(p) for p in output_paths(models_dir, prefix, symbol))
+    )
+
+
+def train_all(panel, symbols=None, models=None, workers=None, threads_per_task=1,
+              models_dir=MODELS_DIR, cache_dir=FORECAST_CACHE_DIR, resume=True,
+              batch_mode=None):
+    """Fit every (model, coin) pair across a process pool.
+
+    Progress is checkpointed to ``training_manifest.json`` in
+    ``models_dir`` after each task. With ``resume`` a task is skipped when
+    the manifest records it as done for the same cache key (same data and
+    hyperparameters) and its output files exist, so an interrupted run
+    picks up where it stopped. With ``batch_mode`` ("direct" or
+    "recursive") the tree models are fitted once per model on all pending
+    coins together instead of once per coin. Returns one summary row per
+    model and coin.
+    """
+    symbols = symbols or sorted(panel["Symbol"].unique())
+    models = models or list(MODELS.values())
+    workers = workers or os.cpu_count() or 1
+
+    os.makedirs(models_dir, exist_ok=True)
+    manifest_path = os.path.join(models_dir, MANIFEST_FILE)
+    manifest = load_manifest(manifest_path) if resume else {}
+
+    pending, skipped = [], []
+    batched = {}
+    for symbol in symbols:
+        close = training_series(panel[panel["Symbol"] == symbol])
+        for prefix in models:
+            name = f"{prefix}/{symbol}"
+            mode = batch_mode if prefix in BATCH_PARAMS else None
+            key = cache_key(symbol, prefix, close, DEFAULT_PARAMS[prefix])
+            if resume and _is_current(manifest.get(name), key, mode, models_dir, prefix, symbol):
+                skipped.append(name)
+                continue
+            manifest[name] = {"cache_key": key, "status": "pending", "batch": mode}
+            if mode:
+                batched.setdefault(prefix, []).append(symbol)
+            else:
+                pending.append((prefix, symbol, None))
+
+    pending += [(prefix, tuple(coins), batch_mode) for prefix, coins in batched.items()]
+
+    # Longest tasks first keeps a worker from picking up a slow fit last.
+    def expected(task):
+        prefix, coins, mode = task
+        if mode:
+            return COST_HINTS.get(prefix, 1) * len(coins)
+        previous = manifest.get(f"{prefix}/{coins}", {}).get("seconds")
+        return previous if previous is not None else COST_HINTS.get(prefix, 1)
+
+    pending.sort(key=expected, reverse=True)
+    _save_manifest(manifest, manifest_path)
+
+    started = time.perf_counter()
+    init_args = (threads_per_task, cache_dir, models_dir)
+
+    def record(task, result):
+        prefix, coins, mode = task
+        finished = pd.Timestamp.now().isoformat(timespec="seconds")
+        symbols = coins if mode else [coins]
+        entry = dict(result, finished=finished)
+        if mode:
+            # One pooled fit served every coin in the batch; each coin is
+            # charged an equal share so task times still add up.
+            entry.update(seconds=result["seconds"] / len(symbols), batch_seconds=result["seconds"])
+        for symbol in symbols:
+            manifest[f"{prefix}/{symbol}"].update(entry)
+        _save_manifest(manifest, manifest_path)
+        label = f"{prefix}/{len(coins)} coins ({mode})" if mode else f"{prefix}/{coins}"
+        print(f"{result['status']:>6}  {result['seconds']:8.1f}s  {label}", flush=True)
+
+    if workers == 1:
+        _init_worker(*init_args)
+        for task in pending:
+            record(task, _train(task))
+    elif pending:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(pending)),
+            initializer=_init_worker,
+            initargs=init_args,
+            # TensorFlow and Prophet hold on to memory; recycle workers.
+            max_tasks_per_child=8,
+        ) as pool:
+            futures = {pool.submit(_train, task): task for task in pending}
+            for future in as_completed(futures):
+                record(futures[future], future.result())
+
+    wall = time.perf_counter() - started
+    ran = {
+        f"{prefix}/{symbol}"
+        for prefix, coins, mode in pending
+        for symbol in (coins if mode else [coins])
+    }
+    summary = pd.DataFrame([
+        {
+            "Model": name.split("/", 1)[0],
+            "Symbol": name.split("/", 1)[1],
+            "Status": manifest[name]["status"] if name in ran else "skipped",
+            "Seconds": manifest[name].get("seconds") if name in ran else None,
+            "Error": manifest[name].get("error"),
+        }
+        for name in sorted(ran.union(skipped))
+    ], columns=["Model", "Symbol", "Status", "Seconds", "Error"])
+    summary.attrs["wall_seconds"] = wall
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Fit every forecasting model for every coin in parallel."
+    )
+    parser.add_argument("--models-dir", default=MODELS_DIR)
+    parser.add_argument("--symbols", nargs="*", default=None)
+    parser.add_argument("--models", nargs="*", default=None, choices=list(MODELS.values()))
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--threads-per-task", type=int, default=1)
+    parser.add_argument(
+        "--batch-trees", choices=["direct", "recursive"], default=None,
+        help="Fit one pooled Random Forest / XGBoost model across all coins."
+    )
+    parser.add_argument(
+        "--no-resume", action="store_true",
+        help="Refit every task even if the manifest says it is up to date."
+    )
+    args = parser.parse_args()
+
+    summary = train_all(
+        read_panel(),
+        symbols=args.symbols,
+        models=args.models,
+        workers=args.workers,
+        threads_per_task=args.threads_per_task,
+        models_dir=args.models_dir,
+        resume=not args.no_resume,
+        batch_mode=args.batch_trees,
+    )
+
+    ran = summary[summary["Status"] != "skipped"]
+    print()
+    print(summary.groupby(["Model", "Status"])["Seconds"].agg(["count", "sum", "mean", "max"]).to_string())
+    print(
+        f"\n{len(ran)} tasks run, {len(summary) - len(ran)} skipped; "
+        f"task time {ran['Seconds'].sum():.1f}s, wall time {summary.attrs['wall_seconds']:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
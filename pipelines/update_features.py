@@ -0,0 +1,177 @@
+import argparse
+import glob
+import io
+import os
+
+import numpy as np
+import pandas as pd
+
+from pipelines.build_features import (
+    CONTEXT_BARS,
+    EMA_SPANS,
+    OUTPUT_PATH,
+    PANEL_COLUMNS,
+    RAW_DIR,
+    build_panel,
+    indicator_block,
+    sort_panel,
+    write_panel,
+)
+
+
+def read_tail(path, n_rows, parse_dates=("Date",)):
+    """Parse the header and the last ``n_rows`` data rows of a CSV.
+
+    Returns the rows and whether they are the whole file.
+    """
+    with open(path, "rb") as fh:
+        header = fh.readline()
+        body_start = fh.tell()
+        fh.seek(0, os.SEEK_END)
+        pos = fh.tell()
+
+        data = b""
+        block = 1 << 16
+        # Keep reading backwards until there is one more newline than rows
+        # wanted; the text before it may be a partial line.
+        while pos > body_start and data.count(b"\n") <= n_rows:
+            step = min(block, pos - body_start)
+            pos -= step
+            fh.seek(pos)
+            data = fh.read(step) + data
+            block *= 2
+
+    lines = data.splitlines()
+    complete = pos <= body_start and len(lines) <= n_rows
+    rows = lines[-n_rows:] if n_rows else []
+
+    df = pd.read_csv(
+        io.BytesIO(header + b"\n".join(rows) + b"\n"),
+        parse_dates=list(parse_dates),
+        float_precision="round_trip"
+    )
+    return df, complete
+
+
+def _panel_context(panel_path, symbols):
+    """Last CONTEXT_BARS panel rows per symbol, read from the end of the file."""
+    n_rows = (CONTEXT_BARS + 1) * max(len(symbols), 1)
+
+    while True:
+        tail, complete = read_tail(panel_path, n_rows)
+        counts = tail["Symbol"].value_counts()
+        if complete or all(counts.get(s, 0) >= CONTEXT_BARS for s in symbols):
+            break
+        n_rows *= 2
+
+    tail = tail.sort_values(["Symbol", "Date"], kind="stable")
+    return tail.groupby("Symbol", sort=False).tail(CONTEXT_BARS)
+
+
+def _new_raw_rows(raw_path, last_date):
+    """Rows of a raw coin file dated after ``last_date`` (all rows if NaT)."""
+    n_rows = 32
+
+    while True:
+        tail, complete = read_tail(raw_path, n_rows)
+        if complete or (pd.notna(last_date) and tail["Date"].iloc[0] <= last_date):
+            break
+        n_rows *= 4
+
+    if pd.isna(last_date):
+        return tail
+    return tail[tail["Date"] > last_date]
+
+
+def compute_new_rows(context, new):
+    """Features for ``new`` bars given each coin's ``context`` panel rows.
+
+    Context rows are right-aligned against the first new bar and NaN-padded
+    in front, so a coin with less than CONTEXT_BARS of history gets the
+    same NaN windows it would get in a full build.
+    """
+    symbols = list(new["Symbol"].unique())
+    codes = {symbol: i for i, symbol in enumerate(symbols)}
+
+    new = new.sort_values(["Symbol", "Date"], kind="stable", ignore_index=True)
+    new_codes = new["Symbol"].map(codes).to_numpy()
+    new_pos = new.groupby("Symbol", sort=False).cumcount().to_numpy()
+
+    close = np.full((CONTEXT_BARS + new_pos.max() + 1, len(symbols)), np.nan)
+    close[CONTEXT_BARS + new_pos, new_codes] = new["Close"].to_numpy(dtype="float64")
+
+    context = context[context["Symbol"].isin(codes)]
+    ctx_codes = context["Symbol"].map(codes).to_numpy()
+    ctx_from_end = context.groupby("Symbol", sort=False).cumcount(ascending=False).to_numpy()
+    close[CONTEXT_BARS - 1 - ctx_from_end, ctx_codes] = context["Close"].to_numpy(dtype="float64")
+
+    last = context.groupby("Symbol", sort=False).tail(1)
+    last_codes = last["Symbol"].map(codes).to_numpy()
+    ema_seeds = {}
+    for span in EMA_SPANS:
+        seed = np.full(len(symbols), np.nan)
+        seed[last_codes] = last[f"EMA_{span}"].to_numpy(dtype="float64")
+        ema_seeds[span] = seed
+
+    out = new.copy()
+    for name, values in indicator_block(close, CONTEXT_BARS, ema_seeds).items():
+        out[name] = values[new_pos, new_codes]
+    return out[PANEL_COLUMNS]
+
+
+def update_panel(raw_dir=RAW_DIR, panel_path=OUTPUT_PATH):
+    """Append features for raw bars that are newer than the panel.
+
+    Only the tail of each file is read. When a new bar is not later than
+    every date already in the panel, appending would break the panel's
+    Date-major order, so the panel is rebuilt instead. Returns the number of
+    rows appended, or None after a rebuild.
+    """
+    if not os.path.exists(panel_path):
+        write_panel(build_panel(raw_dir), panel_path)
+        return None
+
+    raw_paths = sorted(glob.glob(os.path.join(raw_dir, "*.csv")))
+    symbols = [os.path.splitext(os.path.basename(p))[0] for p in raw_paths]
+
+    context = _panel_context(panel_path, symbols)
+    last_dates = context.groupby("Symbol")["Date"].max()
+
+    new = pd.concat(
+        [
+            _new_raw_rows(path, last_dates.get(symbol, pd.NaT))
+            for path, symbol in zip(raw_paths, symbols)
+        ],
+        ignore_index=True
+    )
+    if new.empty:
+        return 0
+
+    if not last_dates.empty and new["Date"].min() <= last_dates.max():
+        write_panel(build_panel(raw_dir), panel_path)
+        return None
+
+    rows = sort_panel(compute_new_rows(context, new))
+    text = rows.to_csv(header=False, index=False, lineterminator="\n")
+    with open(panel_path, "a", newline="") as fh:
+        fh.write(text)
+    return len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Append features for new daily bars to main_crypto_dataset.csv."
+    )
+    parser.add_argument("--raw-dir", default=RAW_DIR)
+    parser.add_argument("--panel", default=OUTPUT_PATH)
+    args = parser.parse_args()
+
+    appended = update_panel(args.raw_dir, args.panel)
+    if appended is None:
+        print(f"Rebuilt {args.panel}")
+    else:
+        print(f"Appended {appended} rows to {args.panel}")
+
+
+if __name__ == "__main__":
+    main()
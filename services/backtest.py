@@ -0,0 +1,294 @@
+import numpy as np
+import pandas as pd
+
+from services.forecasting import DEFAULT_PARAMS, lag_matrix, recursive_forecast
+
+METRIC_COLUMNS = ["MAE", "RMSE", "MAPE", "Direction_Accuracy"]
+
+
+def walk_forward_folds(n_obs, min_train, horizon, step=None, window=None):
+    """(train_start, origin, test_stop) rows for every walk-forward fold.
+
+    Each fold trains on ``[train_start, origin)`` and is scored on
+    ``[origin, test_stop)``. ``window=None`` gives an expanding origin
+    (training always starts at 0); an integer gives a rolling origin with
+    at most ``window`` training bars.
+    """
+    step = step or horizon
+    origins = np.arange(min_train, n_obs - horizon + 1, step)
+    starts = np.zeros_like(origins) if window is None else np.maximum(origins - window, 0)
+    return np.column_stack([starts, origins, origins + horizon])
+
+
+class _Model:
+    """One-step-ahead forecaster walked through consecutive folds.
+
+    ``fit`` trains from scratch. ``update`` moves the model to a new
+    training range; models that can continue from their current state
+    override it, the rest refit. ``predict`` scores the ``n`` bars after
+    the training range, each from the actual bars before it; ``forecast``
+    is the ex-ante path for those bars, using nothing past the origin.
+    """
+
+    def __init__(self, params):
+        self.params = params
+
+    def fit(self, train):
+        raise NotImplementedError
+
+    def update(self, train, new):
+        self.fit(train)
+
+    def predict(self, train, test):
+        raise NotImplementedError
+
+    def forecast(self, train, steps):
+        raise NotImplementedError
+
+
+class _Arima(_Model):
+    def fit(self, train):
+        from statsmodels.tsa.arima.model import ARIMA
+
+        self._result = ARIMA(train.to_numpy(), order=tuple(self.params["order"])).fit()
+        self._n_train = len(train)
+
+    def update(self, train, new):
+        # Carry the estimated coefficients forward and only refresh the
+        # state with the new bars; the walk refits periodically.
+        if len(train) == self._n_train + len(new):
+            self._result = self._result.append(new.to_numpy(), refit=False)
+        else:
+            self._result = self._result.apply(train.to_numpy(), refit=False)
+        self._n_train = len(train)
+
+    def predict(self, train, test):
+        extended = self._result.append(test.to_numpy(), refit=False)
+        return np.asarray(extended.predict(start=len(train), end=len(train) + len(test) - 1))
+
+    def forecast(self, train, steps):
+        return np.asarray(self._result.forecast(steps))
+
+
+class _Prophet(_Model):
+    def fit(self, train, init=None):
+        from prophet import Prophet
+
+        self._model = Prophet(**self.params)
+        self._model.fit(pd.DataFrame({"ds": train.index, "y": train.to_numpy()}), init=init)
+
+    def update(self, train, new):
+        # Start Stan's optimiser from the previous fit's parameters.
+        previous = {
+            name: self._model.params[name][0][0]
+            for name in ("k", "m", "sigma_obs")
+        }
+        previous.update({
+            name: self._model.params[name][0]
+            for name in ("delta", "beta")
+        })
+        self.fit(train, init=previous)
+
+    def predict(self, train, test):
+        return self._model.predict(pd.DataFrame({"ds": test.index}))["yhat"].to_numpy()
+
+    def forecast(self, train, steps):
+        future = self._model.make_future_dataframe(periods=steps, include_history=False)
+        return self._model.predict(future)["yhat"].to_numpy()
+
+
+class _Trees(_Model):
+    """Lag-feature regressor; test rows are one matrix, one predict call."""
+
+    def _matrix(self, values):
+        lags = self.params["lags"]
+        return lag_matrix(values, lags), values[lags:]
+
+    def predict(self, train, test):
+        lags = self.params["lags"]
+        history = np.concatenate([train.to_numpy()[-lags:], test.to_numpy()])
+        return self._model.predict(lag_matrix(history, lags))
+
+    def forecast(self, train, steps):
+        return recursive_forecast(
+            lambda window: self._model.predict(window[None, :])[0],
+            train.to_numpy()[-self.params["lags"]:], steps,
+        )
+
+
+class _RandomForest(_Trees):
+    def _estimator(self, **overrides):
+        from sklearn.ensemble import RandomForestRegressor
+
+        params = {k: v for k, v in self.params.items() if k != "lags"}
+        params.update(overrides)
+        return RandomForestRegressor(n_jobs=1, **params)
+
+    def fit(self, train):
+        self._model = self._estimator()
+        self._model.fit(*self._matrix(train.to_numpy()))
+
+    def update(self, train, new):
+        # warm_start keeps the existing trees and grows extra ones on the
+        # current training range.
+        extra = max(self.params["n_estimators"] // 10, 1)
+        self._model.set_params(
+            warm_start=True, n_estimators=self._model.n_estimators + extra
+        )
+        self._model.fit(*self._matrix(train.to_numpy()))
+
+
+class _XGBoost(_Trees):
+    def _estimator(self, **overrides):
+        from xgboost import XGBRegressor
+
+        params = {k: v for k, v in self.params.items() if k != "lags"}
+        params.update(overrides)
+        return XGBRegressor(n_jobs=1, **params)
+
+    def fit(self, train):
+        self._model = self._estimator()
+        self._model.fit(*self._matrix(train.to_numpy()))
+
+    def update(self, train, new):
+        # Continue boosting from the current booster on the new range.
+        extra = max(self.params["n_estimators"] // 10, 1)
+        booster = self._model.get_booster()
+        self._model = self._estimator(n_estimators=extra)
+        self._model.fit(*self._matrix(train.to_numpy()), xgb_model=booster)
+
+
+class _Lstm(_Model):
+    def fit(self, train):
+        from tensorflow import keras
+
+        keras.utils.set_random_seed(self.params["seed"])
+        lookback = self.params["lookback"]
+        values = train.to_numpy()
+        self._low, self._high = values.min(), values.max()
+
+        self._model = keras.Sequential([
+            keras.layers.Input(shape=(lookback, 1)),
+            keras.layers.LSTM(self.params["units"]),
+            keras.layers.Dense(1),
+        ])
+        self._model.compile(optimizer="adam", loss="mse")
+        self._train_on(values, self.params["epochs"])
+
+    def _scale(self, values):
+        return (values - self._low) / (self._high - self._low)
+
+    def _train_on(self, values, epochs):
+        lookback = self.params["lookback"]
+        scaled = self._scale(values)
+        self._model.fit(
+            lag_matrix(scaled, lookback)[:, :, None], scaled[lookback:],
+            epochs=epochs, batch_size=self.params["batch_size"], verbose=0,
+        )
+
+    def update(self, train, new):
+        # Keep the weights and scaling; a couple of epochs adapt the network
+        # to the bars that entered the window.
+        self._train_on(train.to_numpy(), max(self.params["epochs"] // 5, 1))
+
+    def predict(self, train, test):
+        lookback = self.params["lookback"]
+        history = np.concatenate([train.to_numpy()[-lookback:], test.to_numpy()])
+        X = lag_matrix(self._scale(history), lookback)[:, :, None]
+        scaled = self._model.predict(X, verbose=0)[:, 0]
+        return scaled * (self._high - self._low) + self._low
+
+    def forecast(self, train, steps):
+        scaled = recursive_forecast(
+            lambda window: float(self._model(window[None, :, None], training=False)[0, 0]),
+            self._scale(train.to_numpy()[-self.params["lookback"]:]), steps,
+        )
+        return scaled * (self._high - self._low) + self._low
+
+
+BACKTEST_MODELS = {
+    "arima": _Arima,
+    "prophet": _Prophet,
+    "rf": _RandomForest,
+    "xgb": _XGBoost,
+    "lstm": _Lstm,
+}
+
+
+def walk_forward(close, prefix, folds, first_fold=0, params=None, refit_every=None):
+    """One-step-ahead predictions for each fold of one coin and model.
+
+    The first fold is a full fit; later folds ``update`` the model from
+    the previous one, with a full refit on every fold whose global number
+    is a multiple of ``refit_every`` (``None`` never refits, ``1`` refits
+    every fold). ``folds`` is a
+    contiguous slice of ``walk_forward_folds`` output starting at fold
+    number ``first_fold``. Returns a long frame of Fold, Date, Actual,
+    Predicted, Previous (the last actual before each bar) and Forecast
+    (the ex-ante path from the fold origin).
+    """
+    params = {**DEFAULT_PARAMS[prefix], **(params or {})}
+    model = BACKTEST_MODELS[prefix](params)
+    values = close.to_numpy(dtype="float64")
+
+    frames = []
+    previous_origin = None
+    for i, (start, origin, stop) in enumerate(folds):
+        train = close.iloc[start:origin]
+        if i == 0 or (refit_every and (first_fold + i) % refit_every == 0):
+            model.fit(train)
+        else:
+            model.update(train, close.iloc[previous_origin:origin])
+        previous_origin = origin
+
+        frames.append(pd.DataFrame({
+            "Fold": first_fold + i,
+            "Date": close.index[origin:stop],
+            "Actual": values[origin:stop],
+            "Predicted": np.asarray(model.predict(train, close.iloc[origin:stop]), dtype="float64"),
+            "Previous": values[origin - 1:stop - 1],
+            "Forecast": np.asarray(model.forecast(train, stop - origin), dtype="float64"),
+        }))
+
+    return pd.concat(frames, ignore_index=True)
+
+
+def _with_errors(predictions):
+    error = predictions["Predicted"] - predictions["Actual"]
+    return predictions.assign(
+        _abs=error.abs(),
+        _sq=error * error,
+        _ape=(error / predictions["Actual"]).abs() * 100,
+        _hit=(
+            np.sign(predictions["Predicted"] - predictions["Previous"])
+            == np.sign(predictions["Actual"] - predictions["Previous"])
+        ) * 100.0,
+    )
+
+
+def _metrics(grouped):
+    out = grouped[["_abs", "_sq", "_ape", "_hit"]].mean()
+    out.columns = ["MAE", "RMSE", "MAPE", "Direction_Accuracy"]
+    out["RMSE"] = np.sqrt(out["RMSE"])
+    return out
+
+
+def score_predictions(predictions, keys=("Model", "Coin")):
+    """Per-fold and aggregate metrics from a long prediction frame.
+
+    Every metric is a grouped mean over error columns computed once for
+    all rows, so scoring the whole universe is a couple of vectorised
+    group-bys. Aggregates pool all out-of-sample bars of a coin and model.
+    """
+    keys = list(keys)
+    scored = _with_errors(predictions)
+
+    per_fold = _metrics(scored.groupby(keys + ["Fold"], sort=True))
+    bounds = scored.groupby(keys + ["Fold"], sort=True)["Date"].agg(["min", "max"])
+    per_fold["Test_Start"] = bounds["min"]
+    per_fold["Test_End"] = bounds["max"]
+
+    aggregate = _metrics(scored.groupby(keys, sort=True))
+    aggregate["Folds"] = scored.groupby(keys, sort=True)["Fold"].nunique()
+
+    return per_fold.reset_index(), aggregate.reset_index()
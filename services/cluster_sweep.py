@@ -0,0 +1,12 @@
+import os
+
+SWEEP_PATH = os.path.join("dataset", "cluster_sweep.csv")
+
+SWEEP_METRICS = ["Inertia", "Silhouette", "Stability"]
+
+
+def summarise_sweep(results):
+    """Mean and spread of each metric across seeds, one row per k."""
+    summary = results.groupby("K")[SWEEP_METRICS].agg(["mean", "std"])
+    summary.columns = [f"{metric}_{stat}" for metric, stat in summary.columns]
+    return summary.reset_index()
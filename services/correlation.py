@@ -0,0 +1,264 @@
+import numpy as np
+import pandas as pd
+
+
+class _Correlation:
+    """Shared lookups for engines that maintain a covariance matrix."""
+
+    def __init__(self, symbols):
+        self.symbols = list(symbols)
+        self._index = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+    def covariance(self):
+        raise NotImplementedError
+
+    def _as_rows(self, returns):
+        if isinstance(returns, pd.DataFrame):
+            returns = returns[self.symbols].to_numpy(dtype="float64")
+        return np.atleast_2d(np.asarray(returns, dtype="float64"))
+
+    def matrix(self):
+        cov = self.covariance()
+        scale = np.sqrt(np.diag(cov))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            corr = cov / np.outer(scale, scale)
+        return pd.DataFrame(corr, index=self.symbols, columns=self.symbols)
+
+    def column(self, symbol):
+        """Correlation of every coin with ``symbol`` in O(N)."""
+        cov = self.covariance()
+        j = self._index[symbol]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            values = cov[:, j] / np.sqrt(np.diag(cov) * cov[j, j])
+        return pd.Series(values, index=self.symbols, name=symbol)
+
+
+class CorrelationEngine(_Correlation):
+    """Expanding-window correlation from running co-moments.
+
+    Holds the count, mean vector and co-moment matrix of the return rows
+    seen so far. Each new day is a rank-one Welford update, O(N^2), rather
+    than a fresh O(T N^2) ``DataFrame.corr``. Rows containing a NaN are
+    skipped, matching ``dropna().corr()``.
+    """
+
+    def __init__(self, symbols, returns=None):
+        super().__init__(symbols)
+        n = len(self.symbols)
+        self.count = 0
+        self._mean = np.zeros(n)
+        self._comoment = np.zeros((n, n))
+        if returns is not None:
+            self.extend(returns)
+
+    def update(self, row):
+        x = self._as_rows(row)[0]
+        if np.isnan(x).any():
+            return
+        self.count += 1
+        delta = x - self._mean
+        self._mean += delta / self.count
+        self._comoment += np.outer(delta, x - self._mean)
+
+    def extend(self, returns):
+        rows = self._as_rows(returns)
+        rows = rows[~np.isnan(rows).any(axis=1)]
+        if len(rows) == 0:
+            return
+
+        nb = len(rows)
+        mean_b = rows.mean(axis=0)
+        dev = rows - mean_b
+        comoment_b = dev.T @ dev
+
+        na = self.count
+        n = na + nb
+        delta = mean_b - self._mean
+        self._comoment += comoment_b + np.outer(delta, delta) * na * nb / n
+        self._mean += delta * nb / n
+        self.count = n
+
+    def covariance(self):
+        return self._comoment / (self.count - 1)
+
+
+class EwmCorrelation(_Correlation):
+    """Exponentially weighted correlation with an O(N^2) recurrence.
+
+    Uses the ``adjust=False`` form: each complete row pulls the mean
+    toward itself by ``alpha`` and decays the covariance by ``1 - alpha``.
+    """
+
+    def __init__(self, symbols, halflife, returns=None):
+        super().__init__(symbols)
+        self.alpha = 1 - 0.5 ** (1 / halflife)
+        n = len(self.symbols)
+        self.count = 0
+        self._mean = np.zeros(n)
+        self._cov = np.zeros((n, n))
+        if returns is not None:
+            self.extend(returns)
+
+    def update(self, row):
+        x = self._as_rows(row)[0]
+        if np.isnan(x).any():
+            return
+        if self.count == 0:
+            self._mean = x.copy()
+        else:
+            delta = x - self._mean
+            self._mean += self.alpha * delta
+            self._cov = (1 - self.alpha) * (self._cov + self.alpha * np.outer(delta, delta))
+        self.count += 1
+
+    def extend(self, returns):
+        for row in self._as_rows(returns):
+            self.update(row)
+
+    def covariance(self):
+        return self._cov
+
+
+def _masked_corr(n, sum_i, sum_j, sq_i, sq_j, cross, min_periods):
+    # [i, j] entries are sums over the rows where both coin i and coin j
+    # are present; sum_i/sq_i are of coin i, sum_j/sq_j of coin j.
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = n * cross - sum_i * sum_j
+        var_i = np.maximum(n * sq_i - sum_i * sum_i, 0.0)
+        var_j = np.maximum(n * sq_j - sum_j * sum_j, 0.0)
+        corr = np.clip(cov / np.sqrt(var_i * var_j), -1.0, 1.0)
+    return np.where(n >= min_periods, corr, np.nan)
+
+
+class PairwiseCorrelationEngine(_Correlation):
+    """Pairwise-complete correlation: each pair uses all rows where both
+    coins have a return, as ``DataFrame.corr()`` does.
+
+    Keeps per-pair masked sums (count, sum, sum of squares, cross
+    product) as N x N matrices. A batch of rows is five matrix products
+    over the 0/1 presence mask, the same O(T N^2) BLAS work as the dense
+    path, and a single new day is an O(N^2) outer-product update. Values
+    are shifted by a per-coin reference mean to limit cancellation.
+    """
+
+    def __init__(self, symbols, returns=None, min_periods=2):
+        super().__init__(symbols)
+        n = len(self.symbols)
+        self.min_periods = max(min_periods, 2)
+        self._shift = None
+        self._count = np.zeros((n, n))
+        self._sum = np.zeros((n, n))
+        self._sum_sq = np.zeros((n, n))
+        self._cross = np.zeros((n, n))
+        if returns is not None:
+            self.extend(returns)
+
+    def _masked(self, rows):
+        present = ~np.isnan(rows)
+        if self._shift is None:
+            counts = present.sum(axis=0)
+            totals = np.where(present, rows, 0.0).sum(axis=0)
+            self._shift = np.divide(
+                totals, counts, out=np.zeros(rows.shape[1]), where=counts > 0
+            )
+        values = np.where(present, rows - self._shift, 0.0)
+        return values, present.astype("float64")
+
+    def update(self, row):
+        values, present = self._masked(self._as_rows(row))
+        values, present = values[0], present[0]
+        self._count += np.outer(present, present)
+        self._sum += np.outer(values, present)
+        self._sum_sq += np.outer(values * values, present)
+        self._cross += np.outer(values, values)
+
+    def extend(self, returns):
+        values, present = self._masked(self._as_rows(returns))
+        self._count += present.T @ present
+        self._sum += values.T @ present
+        self._sum_sq += (values * values).T @ present
+        self._cross += values.T @ values
+
+    def block(self, cols):
+        """Correlations of every coin (rows) with the coins at ``cols``.
+
+        Only an N x len(cols) block is formed, so callers can walk a large
+        universe in column chunks.
+        """
+        return _masked_corr(
+            self._count[:, cols],
+            self._sum[:, cols],
+            self._sum[cols, :].T,
+            self._sum_sq[:, cols],
+            self._sum_sq[cols, :].T,
+            self._cross[:, cols],
+            self.min_periods,
+        )
+
+    def covariance(self):
+        n = self._count
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cov = (self._cross - self._sum * self._sum.T / n) / (n - 1)
+        return np.where(n >= self.min_periods, cov, np.nan)
+
+    def matrix(self):
+        corr = self.block(slice(None))
+        return pd.DataFrame(corr, index=self.symbols, columns=self.symbols)
+
+    def column(self, symbol):
+        j = self._index[symbol]
+        return pd.Series(self.block([j])[:, 0], index=self.symbols, name=symbol)
+
+
+def rolling_corr_stack(returns, window, out=None, min_periods=None):
+    """Pairwise-complete correlation matrix for every trailing window.
+
+    Returns (or fills ``out`` with) a (T - window + 1, N, N) array whose
+    slice ``t`` covers rows ``t .. t + window - 1``. Masked sums are slid
+    one row at a time, adding the new row and subtracting the one that
+    left, so each step is O(N^2); they are recomputed directly once per
+    ``window`` steps to stop add/subtract rounding from drifting.
+    """
+    rows = returns.to_numpy(dtype="float64")
+    n_rows, n_cols = rows.shape
+    min_periods = max(min_periods or window // 2, 2)
+
+    if out is None:
+        out = np.empty((max(n_rows - window + 1, 0), n_cols, n_cols), dtype="float32")
+    if n_rows < window:
+        return out
+
+    present = ~np.isnan(rows)
+    counts = present.sum(axis=0)
+    shift = np.divide(
+        np.where(present, rows, 0.0).sum(axis=0), counts,
+        out=np.zeros(n_cols), where=counts > 0
+    )
+    values = np.where(present, rows - shift, 0.0)
+    mask = present.astype("float64")
+
+    def window_sums(stop):
+        v, m = values[stop - window:stop], mask[stop - window:stop]
+        return [m.T @ m, v.T @ m, (v * v).T @ m, v.T @ v]
+
+    def slide(sums, row, sign):
+        v, m = values[row], mask[row]
+        sums[0] += sign * np.outer(m, m)
+        sums[1] += sign * np.outer(v, m)
+        sums[2] += sign * np.outer(v * v, m)
+        sums[3] += sign * np.outer(v, v)
+
+    sums = window_sums(window)
+    for stop in range(window, n_rows + 1):
+        if stop > window:
+            if (stop - window) % window == 0:
+                sums = window_sums(stop)
+            else:
+                slide(sums, stop - 1, 1.0)
+                slide(sums, stop - 1 - window, -1.0)
+
+        count, total, total_sq, cross = sums
+        out[stop - window] = _masked_corr(
+            count, total, total.T, total_sq, total_sq.T, cross, min_periods
+        )
+    return out
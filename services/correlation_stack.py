@@ -0,0 +1,54 @@
+import json
+import os
+
+import numpy as np
+
+from services.correlation import rolling_corr_stack
+from services.csv_cache import CACHE_DIR
+from services.neighbors import returns_fingerprint
+
+ROLLING_WINDOWS = (30, 90, 180)
+
+
+def _paths(window, directory):
+    stem = os.path.join(directory, f"rolling_corr_{window}")
+    return f"{stem}.npy", f"{stem}.json"
+
+
+def load_or_build_stack(returns, window, directory=CACHE_DIR):
+    """Memory-mapped (date x coin x coin) float32 rolling correlation stack.
+
+    Returns ``(end_dates, symbols, stack)`` where ``stack[t]`` is the
+    correlation matrix of the ``window`` days ending at ``end_dates[t]``.
+    The ``.npy`` file is rebuilt only when the return matrix changes;
+    otherwise it is opened read-only with ``mmap_mode="r"``, so picking a
+    date reads one N x N slice from disk.
+    """
+    path, meta_path = _paths(window, directory)
+    fingerprint = returns_fingerprint(returns)
+    end_dates = returns.index[window - 1:]
+    symbols = [str(c) for c in returns.columns]
+
+    if os.path.exists(path) and os.path.exists(meta_path):
+        with open(meta_path) as fh:
+            meta = json.load(fh)
+        if meta.get("returns_sha256") == fingerprint:
+            return end_dates, symbols, np.load(path, mmap_mode="r")
+
+    if len(end_dates) == 0:
+        return end_dates, symbols, np.empty((0, len(symbols), len(symbols)), dtype="float32")
+
+    os.makedirs(directory, exist_ok=True)
+    shape = (len(end_dates), len(symbols), len(symbols))
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+
+    stack = np.lib.format.open_memmap(tmp_path, mode="w+", dtype="float32", shape=shape)
+    rolling_corr_stack(returns, window, out=stack)
+    stack.flush()
+    del stack
+    os.replace(tmp_path, path)
+
+    with open(meta_path, "w") as fh:
+        json.dump({"returns_sha256": fingerprint, "window": window, "symbols": symbols}, fh)
+
+    return end_dates, symbols, np.load(path, mmap_mode="r")
@@ -0,0 +1,246 @@
+import os
+
+import pandas as pd
+import streamlit as st
+
+from services.correlation import (
+    CorrelationEngine,
+    EwmCorrelation,
+    PairwiseCorrelationEngine,
+)
+from services.correlation_stack import load_or_build_stack
+from services.csv_cache import read_csv_cached
+from services.forecasting import (
+    FORECAST_DAYS,
+    MODELS,
+    forecast_entry_dir,
+    get_forecast as _get_forecast,
+    training_series,
+)
+from services.intervals import get_intervals, log_residuals
+from services.signal_backtest import forecast_horizon, historical_signals, signal_positions
+from services.signals import crossovers
+from services.neighbors import NeighborIndex, load_or_build_index
+
+DATA_PATH = "dataset/main_crypto_dataset.csv"
+BACKTEST_PREDICTIONS_PATH = "dataset/models/model_backtest_predictions.feather"
+
+PRICE_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+FEATURE_COLUMNS = [
+    "SMA_7",
+    "SMA_14",
+    "EMA_7",
+    "EMA_14",
+    "Daily_Return",
+    "Log_Return",
+    "Volatility_7",
+    "Volatility_14",
+]
+
+# Per-coin frames handed out below are views into the one shared panel.
+# Copy-on-write guarantees a view that gets modified is copied first, so a
+# page can never write through into the panel other pages are reading.
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+
+def read_panel(path=DATA_PATH):
+    dtypes = {col: "float64" for col in PRICE_COLUMNS + FEATURE_COLUMNS}
+    dtypes["Symbol"] = "category"
+    dtypes["Name"] = "category"
+
+    df = read_csv_cached(path, parse_dates=["Date"], dtype=dtypes)
+
+    return (
+        df.sort_values(["Symbol", "Date"], kind="stable")
+        .set_index("Date")
+    )
+
+
+@st.cache_resource
+def load_panel():
+    """Load the feature panel once per process.
+
+    Rows are sorted by Symbol then Date with Date as the index, so every coin
+    is one contiguous block. ``st.cache_resource`` hands back the same object
+    on every call instead of unpickling a fresh copy the way ``st.cache_data``
+    does.
+    """
+    return read_panel()
+
+
+@st.cache_resource
+def _coin_bounds():
+    codes = load_panel()["Symbol"].cat.codes.to_numpy()
+    categories = load_panel()["Symbol"].cat.categories
+
+    starts = codes.searchsorted(range(len(categories)), side="left")
+    stops = codes.searchsorted(range(len(categories)), side="right")
+
+    return {
+        symbol: (start, stop)
+        for symbol, start, stop in zip(categories, starts, stops)
+        if stop > start
+    }
+
+
+def get_symbols():
+    return sorted(_coin_bounds())
+
+
+def get_coin(symbol):
+    """Return the date-indexed rows for one coin as a view into the panel."""
+    start, stop = _coin_bounds()[symbol]
+    return load_panel().iloc[start:stop]
+
+
+@st.cache_resource
+def get_returns_matrix(column="Daily_Return"):
+    """Wide Date x Symbol matrix of one feature column."""
+    df = load_panel()
+    return df.pivot(columns="Symbol", values=column)
+
+
+@st.cache_resource
+def get_crossover_signals(fast="Close", slow="SMA_14"):
+    """(buy, sell) Date x Symbol frames of ``fast`` crossing ``slow``.
+
+    Computed for the whole universe in one array operation.
+    """
+    fast_df = get_returns_matrix(fast)
+    slow_df = get_returns_matrix(slow)[fast_df.columns]
+    up, down = crossovers(fast_df.to_numpy(), slow_df.to_numpy())
+    return (
+        pd.DataFrame(up, index=fast_df.index, columns=fast_df.columns),
+        pd.DataFrame(down, index=fast_df.index, columns=fast_df.columns),
+    )
+
+
+@st.cache_resource
+def get_correlation_engine(halflife=None, pairwise=False):
+    """Daily_Return correlation engine: expanding or EWM.
+
+    The expanding engine drops any day where a coin has no return unless
+    ``pairwise`` is set, in which case each pair uses its full overlap.
+    """
+    returns = get_returns_matrix("Daily_Return")
+    symbols = sorted(returns.columns)
+
+    if halflife:
+        return EwmCorrelation(symbols, halflife, returns)
+    if pairwise:
+        return PairwiseCorrelationEngine(symbols, returns)
+    return CorrelationEngine(symbols, returns)
+
+
+@st.cache_resource
+def get_neighbor_index():
+    """Persisted top-k correlation neighbours, rebuilt when returns change."""
+    return NeighborIndex(load_or_build_index(get_returns_matrix("Daily_Return")))
+
+
+@st.cache_resource
+def get_rolling_corr_stack(window):
+    """(end_dates, symbols, memory-mapped stack) of rolling correlations."""
+    return load_or_build_stack(get_returns_matrix("Daily_Return"), window)
+
+
+@st.cache_resource(show_spinner=False)
+def get_forecast(symbol, model):
+    """(predicted, forecast) frames for one coin and model prefix.
+
+    Fitted on first use and served from the on-disk forecast cache after
+    that; see ``services.forecasting.get_forecast``.
+    """
+    return _get_forecast(symbol, model, training_series(get_coin(symbol)))
+
+
+def _file_mtime(path):
+    """``path``'s mtime in ns as a cache key, or None while it does not exist."""
+    return os.stat(path).st_mtime_ns if os.path.exists(path) else None
+
+
+@st.cache_resource(max_entries=1)
+def _read_backtest_predictions(mtime_ns):
+    return pd.read_feather(BACKTEST_PREDICTIONS_PATH)
+
+
+def _backtest_predictions():
+    """Stored walk-forward predictions, reread whenever the file changes.
+
+    A missing file is not cached, so a backtest run while the app is up is
+    picked up on the next rerun.
+    """
+    mtime_ns = _file_mtime(BACKTEST_PREDICTIONS_PATH)
+    if mtime_ns is None:
+        return None
+    return _read_backtest_predictions(mtime_ns)
+
+
+def get_forecast_intervals(symbol, model, method="conformal"):
+    """Horizon quantiles for one coin's forecast, or None without a backtest.
+
+    Residuals must be held out, so they come only from the walk-forward
+    backtest; an in-sample fit (near zero for the tree models) would give
+    bands far too narrow. The quantile table is stored inside the
+    forecast's cache entry. Results are cached per version of the
+    backtest predictions file.
+    """
+    return _forecast_intervals(symbol, model, method, _file_mtime(BACKTEST_PREDICTIONS_PATH))
+
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def _forecast_intervals(symbol, model, method, backtest_mtime):
+    close = training_series(get_coin(symbol))
+    name = {prefix: label for label, prefix in MODELS.items()}[model]
+    predictions = _backtest_predictions()
+    if predictions is None:
+        return None
+    rows = predictions[(predictions["Model"] == name) & (predictions["Coin"] == symbol)]
+    if rows.empty:
+        return None
+    # h-day errors sum consecutive residuals, so they must be in time order.
+    rows = rows.sort_values(["Fold", "Date"], kind="stable")
+
+    # The forecast owns the cache entry the interval table is stored in.
+    get_forecast(symbol, model)
+    residuals = log_residuals(rows["Actual"], rows["Predicted"])
+    return get_intervals(
+        forecast_entry_dir(symbol, model, close), residuals, FORECAST_DAYS, method
+    )
+
+
+def get_backtest_horizon():
+    """Bars ahead the stored backtest forecasts reach; None until the
+    walk-forward backtest has stored forecast paths."""
+    return _backtest_horizon(_file_mtime(BACKTEST_PREDICTIONS_PATH))
+
+
+@st.cache_resource(max_entries=1)
+def _backtest_horizon(backtest_mtime):
+    predictions = _backtest_predictions()
+    if predictions is None or "Forecast" not in predictions:
+        return None
+    return forecast_horizon(predictions) or None
+
+
+def get_signal_replay(horizon):
+    """(positions, returns) replaying every model's past signals at one horizon.
+
+    None until the walk-forward backtest has stored forecast paths. Cached
+    per version of the backtest predictions file.
+    """
+    return _signal_replay(horizon, _file_mtime(BACKTEST_PREDICTIONS_PATH))
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _signal_replay(horizon, backtest_mtime):
+    predictions = _backtest_predictions()
+    if predictions is None or "Forecast" not in predictions:
+        return None
+
+    closes = get_returns_matrix("Close")
+    signals = historical_signals(predictions.dropna(subset=["Forecast"]), closes, horizon)
+    if signals.empty:
+        return None
+    return signal_positions(signals, closes, horizon)
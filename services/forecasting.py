@@ -0,0 +1,411 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from services.csv_cache import CACHE_DIR
+
+FORECAST_CACHE_DIR = os.path.join(CACHE_DIR, "forecasts")
+FORECAST_DAYS = 90
+
+MODELS = {
+    "ARIMA": "arima",
+    "LSTM": "lstm",
+    "Random Forest": "rf",
+    "XGBoost": "xgb",
+    "Prophet": "prophet",
+}
+
+FORECAST_COLUMNS = {
+    "arima": "ARIMA_Forecast_Close",
+    "lstm": "LSTM_Forecast_Close",
+    "rf": "RF_Forecast_Close",
+    "xgb": "XGBoost_Forecast_Close",
+    "prophet": "Prophet_Forecast_Close",
+}
+
+DEFAULT_PARAMS = {
+    "arima": {"order": [5, 1, 0]},
+    "lstm": {"lookback": 30, "units": 50, "epochs": 10, "batch_size": 32, "seed": 42},
+    "rf": {"lags": 7, "n_estimators": 200, "max_depth": None, "random_state": 42},
+    "xgb": {
+        "lags": 7, "n_estimators": 300, "max_depth": 4,
+        "learning_rate": 0.05, "random_state": 42,
+    },
+    "prophet": {"yearly_seasonality": True, "weekly_seasonality": True, "daily_seasonality": False},
+}
+
+# Threads a single fit may use; None lets each library use every core.
+# Kept out of the params so it never changes a cache key.
+_THREAD_LIMIT = None
+
+
+def set_thread_limit(threads):
+    global _THREAD_LIMIT
+    _THREAD_LIMIT = threads
+
+
+def training_series(coin_frame, start=None, end=None):
+    """Close prices from the first bar with every feature populated.
+
+    ``start``/``end`` (inclusive) narrow the training range further.
+    """
+    close = coin_frame.dropna()["Close"]
+    return close.loc[start:end].astype("float64")
+
+
+def lag_matrix(values, lags):
+    """Rows of the ``lags`` previous values for each target in ``values[lags:]``."""
+    return np.lib.stride_tricks.sliding_window_view(values[:-1], lags)
+
+
+def recursive_forecast(predict_next, history, steps):
+    window = list(history)
+    out = np.empty(steps)
+    for step in range(steps):
+        out[step] = predict_next(np.asarray(window))
+        window = window[1:] + [out[step]]
+    return out
+
+
+def _fit_arima(close, params, steps):
+    from statsmodels.tsa.arima.model import ARIMA
+
+    fitted = ARIMA(close.to_numpy(), order=tuple(params["order"])).fit()
+    predicted = pd.Series(fitted.predict(start=0, end=len(close) - 1), index=close.index)
+    return fitted, predicted, np.asarray(fitted.forecast(steps))
+
+
+def _fit_prophet(close, params, steps):
+    from prophet import Prophet
+
+    model = Prophet(**params)
+    model.fit(pd.DataFrame({"ds": close.index, "y": close.to_numpy()}))
+    future = model.make_future_dataframe(periods=steps, include_history=True)
+    yhat = model.predict(future)["yhat"].to_numpy()
+    predicted = pd.Series(yhat[:len(close)], index=close.index)
+    return model, predicted, yhat[len(close):]
+
+
+def _fit_trees(model, close, lags, steps):
+    values = close.to_numpy()
+    X = lag_matrix(values, lags)
+    model.fit(X, values[lags:])
+    predicted = pd.Series(model.predict(X), index=close.index[lags:])
+    forecast = recursive_forecast(
+        lambda window: model.predict(window[None, :])[0], values[-lags:], steps
+    )
+    return model, predicted, forecast
+
+
+def _fit_rf(close, params, steps):
+    from sklearn.ensemble import RandomForestRegressor
+
+    params = dict(params)
+    lags = params.pop("lags")
+    model = RandomForestRegressor(n_jobs=_THREAD_LIMIT or -1, **params)
+    return _fit_trees(model, close, lags, steps)
+
+
+def _fit_xgb(close, params, steps):
+    from xgboost import XGBRegressor
+
+    params = dict(params)
+    lags = params.pop("lags")
+    return _fit_trees(XGBRegressor(n_jobs=_THREAD_LIMIT, **params), close, lags, steps)
+
+
+def _fit_lstm(close, params, steps):
+    import tensorflow as tf
+    from sklearn.preprocessing import MinMaxScaler
+    from tensorflow import keras
+
+    if _THREAD_LIMIT:
+        tf.config.threading.set_intra_op_parallelism_threads(_THREAD_LIMIT)
+        tf.config.threading.set_inter_op_parallelism_threads(1)
+    keras.utils.set_random_seed(params["seed"])
+    lookback = params["lookback"]
+
+    scaler = MinMaxScaler()
+    scaled = scaler.fit_transform(close.to_numpy()[:, None])[:, 0]
+    X = lag_matrix(scaled, lookback)[:, :, None]
+
+    model = keras.Sequential([
+        keras.layers.Input(shape=(lookback, 1)),
+        keras.layers.LSTM(params["units"]),
+        keras.layers.Dense(1),
+    ])
+    model.compile(optimizer="adam", loss="mse")
+    model.fit(
+        X, scaled[lookback:],
+        epochs=params["epochs"], batch_size=params["batch_size"], verbose=0,
+    )
+
+    def unscale(values):
+        return scaler.inverse_transform(np.asarray(values).reshape(-1, 1))[:, 0]
+
+    predicted = pd.Series(
+        unscale(model.predict(X, verbose=0)), index=close.index[lookback:]
+    )
+    forecast = recursive_forecast(
+        lambda window: float(model(window[None, :, None], training=False)[0, 0]),
+        scaled[-lookback:], steps,
+    )
+    return model, predicted, unscale(forecast)
+
+
+_FITTERS = {
+    "arima": _fit_arima,
+    "lstm": _fit_lstm,
+    "rf": _fit_rf,
+    "xgb": _fit_xgb,
+    "prophet": _fit_prophet,
+}
+
+
+def cache_key(symbol, prefix, close, params, steps=FORECAST_DAYS):
+    """Content address of one fit: coin, model, training data and settings.
+
+    The training range enters through the hashed dates and prices, so a
+    new bar or a different ``start``/``end`` is a different key.
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps(
+        {"symbol": symbol, "model": prefix, "params": params, "steps": steps},
+        sort_keys=True,
+    ).encode())
+    digest.update(np.ascontiguousarray(close.index.asi8).tobytes())
+    digest.update(np.ascontiguousarray(close.to_numpy(dtype="float64")).tobytes())
+    return digest.hexdigest()
+
+
+def forecast_entry_dir(symbol, prefix, close, params=None, steps=FORECAST_DAYS,
+                       cache_dir=FORECAST_CACHE_DIR):
+    """Cache directory of one single-coin fit; it may not exist yet."""
+    params = {**DEFAULT_PARAMS[prefix], **(params or {})}
+    return os.path.join(cache_dir, cache_key(symbol, prefix, close, params, steps))
+
+
+def _save_model(model, prefix, directory):
+    if prefix == "lstm":
+        model.save(os.path.join(directory, "model.keras"))
+    else:
+        import joblib
+
+        joblib.dump(model, os.path.join(directory, "model.joblib"))
+
+
+def load_model(entry_dir, prefix):
+    """Fitted model stored in a cache entry."""
+    if prefix == "lstm":
+        from tensorflow import keras
+
+        return keras.models.load_model(os.path.join(entry_dir, "model.keras"))
+
+    import joblib
+
+    return joblib.load(os.path.join(entry_dir, "model.joblib"))
+
+
+def _read_entry(entry_dir):
+    predicted = pd.read_feather(os.path.join(entry_dir, "predicted.feather"))
+    forecast = pd.read_feather(os.path.join(entry_dir, "forecast.feather"))
+    return predicted, forecast
+
+
+def _store_entry(entry_dir, predicted_df, forecast_df, model, prefix, meta):
+    # Build the entry beside its final location and rename it into place,
+    # so a reader never sees a half-written entry.
+    tmp_dir = f"{entry_dir}.{os.getpid()}.tmp"
+    os.makedirs(tmp_dir, exist_ok=True)
+    predicted_df.to_feather(os.path.join(tmp_dir, "predicted.feather"))
+    forecast_df.to_feather(os.path.join(tmp_dir, "forecast.feather"))
+    _save_model(model, prefix, tmp_dir)
+    with open(os.path.join(tmp_dir, "meta.json"), "w") as fh:
+        json.dump(meta, fh)
+
+    try:
+        os.rename(tmp_dir, entry_dir)
+    except OSError:
+        # Another process stored the same entry first; both are identical.
+        import shutil
+
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def get_forecast(symbol, prefix, close, params=None, steps=FORECAST_DAYS,
+                 cache_dir=FORECAST_CACHE_DIR):
+    """In-sample predictions and a ``steps``-day forecast for one coin.
+
+    Returns ``(predicted_df, forecast_df)`` shaped like the old
+    ``{prefix}_{coin}_predicted.csv`` / ``_3_month_forecast.csv`` files.
+    The first request fits the model and stores it with its outputs under
+    ``cache_dir/<cache_key>``; later requests with the same inputs only
+    read that entry.
+    """
+    params = {**DEFAULT_PARAMS[prefix], **(params or {})}
+    entry_dir = forecast_entry_dir(symbol, prefix, close, params, steps, cache_dir)
+
+    if os.path.exists(os.path.join(entry_dir, "meta.json")):
+        return _read_entry(entry_dir)
+
+    model, predicted, forecast = _FITTERS[prefix](close, params, steps)
+
+    predicted_df = pd.DataFrame({
+        "Date": predicted.index,
+        "Predicted_Close": predicted.to_numpy(dtype="float64"),
+    })
+    forecast_df = pd.DataFrame({
+        "Date": pd.date_range(close.index[-1] + pd.Timedelta(days=1), periods=steps, freq="D"),
+        FORECAST_COLUMNS[prefix]: np.asarray(forecast, dtype="float64"),
+    })
+
+    _store_entry(entry_dir, predicted_df, forecast_df, model, prefix, {
+        "symbol": symbol,
+        "model": prefix,
+        "params": params,
+        "steps": steps,
+        "train_start": str(close.index[0].date()),
+        "train_end": str(close.index[-1].date()),
+    })
+
+    return predicted_df, forecast_df
+
+
+BATCH_MODES = ("direct", "recursive")
+
+# The pooled training set is one window per bar per coin, about 30 times
+# a single coin's, so the batched forests subsample rows and stop
+# splitting earlier to keep the one fit affordable.
+BATCH_PARAMS = {
+    "rf": {"min_samples_leaf": 10, "max_samples": 0.3},
+    "xgb": {},
+}
+
+
+def _log_windows(close, lags, horizon):
+    """Lag features and targets as log-ratios to the last lag bar.
+
+    Ratios make every coin's windows scale-free, so one pooled model can
+    serve the whole universe.
+    """
+    logs = np.log(close.to_numpy(dtype="float64"))
+    windows = np.lib.stride_tricks.sliding_window_view(logs, lags + horizon)
+    base = windows[:, lags - 1:lags]
+    return windows[:, :lags] - base, windows[:, lags:] - base
+
+
+def _batch_estimator(prefix, params, n_outputs):
+    params = {k: v for k, v in params.items() if k != "lags"}
+    if prefix == "rf":
+        from sklearn.ensemble import RandomForestRegressor
+
+        # Random forests split on all outputs at once natively.
+        return RandomForestRegressor(n_jobs=_THREAD_LIMIT or -1, **params)
+
+    from xgboost import XGBRegressor
+
+    if n_outputs > 1:
+        params.update(tree_method="hist", multi_strategy="multi_output_tree")
+    return XGBRegressor(n_jobs=_THREAD_LIMIT, **params)
+
+
+def _fit_batch(prefix, closes, params, steps, mode):
+    lags = params["lags"]
+    n_outputs = steps if mode == "direct" else 1
+
+    features, targets = zip(*(_log_windows(close, lags, n_outputs) for close in closes.values()))
+    model = _batch_estimator(prefix, params, n_outputs)
+    y = np.concatenate(targets)
+    model.fit(np.concatenate(features), y if n_outputs > 1 else y[:, 0])
+
+    def as_matrix(prediction):
+        return np.asarray(prediction).reshape(len(prediction), -1)
+
+    # In-sample one-step predictions for every coin: one call.
+    logs = {symbol: np.log(close.to_numpy(dtype="float64")) for symbol, close in closes.items()}
+    in_sample = [
+        np.lib.stride_tricks.sliding_window_view(values[:-1], lags) - values[lags - 1:-1, None]
+        for values in logs.values()
+    ]
+    one_step = as_matrix(model.predict(np.concatenate(in_sample)))[:, 0]
+    bases = np.concatenate([values[lags - 1:-1] for values in logs.values()])
+    fitted = np.exp(bases + one_step)
+
+    # Out-of-sample: all coins share each predict call.
+    window = np.stack([values[-lags:] for values in logs.values()])
+    if mode == "direct":
+        base = window[:, -1:]
+        forecast = np.exp(base + as_matrix(model.predict(window - base)))
+    else:
+        forecast = np.empty((len(window), steps))
+        for step in range(steps):
+            base = window[:, -1:]
+            next_log = base[:, 0] + as_matrix(model.predict(window - base))[:, 0]
+            forecast[:, step] = np.exp(next_log)
+            window = np.column_stack([window[:, 1:], next_log])
+
+    return model, fitted, forecast
+
+
+def get_forecast_batch(prefix, closes, params=None, steps=FORECAST_DAYS, mode="direct",
+                       cache_dir=FORECAST_CACHE_DIR):
+    """Forecasts for many coins from one pooled tree model.
+
+    ``closes`` maps symbol to training Close series. ``mode="direct"``
+    fits a multi-output model that predicts all ``steps`` horizons at
+    once, so the whole universe is one predict call; ``"recursive"`` fits
+    a one-step model and rolls every coin forward together, one call per
+    step. Returns ``{symbol: (predicted_df, forecast_df)}`` in the shape
+    of ``get_forecast``; the fit is cached like a single-coin fit.
+    """
+    if mode not in BATCH_MODES:
+        raise ValueError(f"mode must be one of {BATCH_MODES}")
+    if prefix not in BATCH_PARAMS:
+        raise ValueError(f"Batched forecasting supports rf and xgb, not {prefix!r}")
+    params = {**DEFAULT_PARAMS[prefix], **BATCH_PARAMS[prefix], **(params or {})}
+    symbols = sorted(closes)
+    closes = {symbol: closes[symbol] for symbol in symbols}
+
+    digest = hashlib.sha256(json.dumps({"mode": mode, "symbols": symbols}).encode())
+    for symbol, close in closes.items():
+        digest.update(cache_key(symbol, prefix, close, params, steps).encode())
+    entry_dir = os.path.join(cache_dir, f"batch-{digest.hexdigest()}")
+
+    if os.path.exists(os.path.join(entry_dir, "meta.json")):
+        predicted_df, forecast_df = _read_entry(entry_dir)
+    else:
+        model, fitted, forecast = _fit_batch(prefix, closes, params, steps, mode)
+        lags = params["lags"]
+        predicted_df = pd.DataFrame({
+            "Symbol": np.repeat(symbols, [len(closes[s]) - lags for s in symbols]),
+            "Date": np.concatenate([closes[s].index[lags:] for s in symbols]),
+            "Predicted_Close": fitted,
+        })
+        forecast_df = pd.DataFrame({
+            "Symbol": np.repeat(symbols, steps),
+            "Date": np.concatenate([
+                pd.date_range(closes[s].index[-1] + pd.Timedelta(days=1), periods=steps, freq="D")
+                for s in symbols
+            ]),
+            FORECAST_COLUMNS[prefix]: forecast.ravel(),
+        })
+        _store_entry(entry_dir, predicted_df, forecast_df, model, prefix, {
+            "symbols": symbols,
+            "model": prefix,
+            "mode": mode,
+            "params": params,
+            "steps": steps,
+        })
+
+    predicted_groups = dict(tuple(predicted_df.groupby("Symbol", sort=False)))
+    forecast_groups = dict(tuple(forecast_df.groupby("Symbol", sort=False)))
+    return {
+        symbol: (
+            predicted_groups[symbol].drop(columns="Symbol").reset_index(drop=True),
+            forecast_groups[symbol].drop(columns="Symbol").reset_index(drop=True),
+        )
+        for symbol in symbols
+    }
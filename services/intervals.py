@@ -0,0 +1,97 @@
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+COVERAGES = (0.5, 0.8, 0.95)
+METHODS = ("conformal", "empirical")
+
+
+def log_residuals(actual, predicted):
+    """log(actual / predicted), with non-finite pairs dropped."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        residuals = np.log(np.asarray(actual, dtype="float64") / np.asarray(predicted, dtype="float64"))
+    return residuals[np.isfinite(residuals)]
+
+
+def horizon_quantiles(residuals, steps, coverages=COVERAGES, method="conformal"):
+    """Lower/upper log-offsets of a central interval for every horizon.
+
+    The h-day error is taken as the sum of ``h`` consecutive one-step
+    residuals, so the band widens with the horizon and keeps whatever
+    autocorrelation the residuals have. All horizons come from one
+    cumulative sum: row ``h - 1`` of an (steps x n) matrix holds every
+    h-day window sum, padded with NaN, and one sort gives the order
+    statistics for all of them. ``"conformal"`` uses the split-conformal
+    rank ``ceil((n + 1) p)``, which guarantees the nominal coverage for
+    exchangeable residuals; ``"empirical"`` uses the plain sample quantile.
+    """
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {METHODS}")
+    residuals = np.asarray(residuals, dtype="float64")
+    n = len(residuals)
+    horizons = np.arange(1, steps + 1)
+
+    cumulative = np.concatenate([[0.0], np.cumsum(residuals)])
+    starts = np.arange(n)
+    stops = starts[None, :] + horizons[:, None]
+    valid = stops <= n
+    sums = np.where(valid, cumulative[np.minimum(stops, n)] - cumulative[starts], np.nan)
+    ordered = np.sort(sums, axis=1)
+    counts = valid.sum(axis=1)
+
+    def order_stat(p, upper):
+        if method == "conformal":
+            rank = np.ceil((counts + 1) * p) if upper else np.floor((counts + 1) * p)
+            k = rank - 1
+        else:
+            k = np.round(p * (counts - 1))
+        k = np.clip(k, 0, np.maximum(counts - 1, 0)).astype("int64")
+        values = np.take_along_axis(ordered, k[:, None], axis=1)[:, 0]
+        return np.where(counts > 0, values, np.nan)
+
+    table = {"Horizon": horizons}
+    for coverage in coverages:
+        alpha = 1 - coverage
+        label = f"{coverage * 100:.0f}"
+        table[f"Lower_{label}"] = order_stat(alpha / 2, upper=False)
+        table[f"Upper_{label}"] = order_stat(1 - alpha / 2, upper=True)
+    return pd.DataFrame(table)
+
+
+def apply_intervals(forecast, quantiles, coverage):
+    """Price bands for a forecast Series or array from ``horizon_quantiles``."""
+    label = f"{coverage * 100:.0f}"
+    values = np.asarray(forecast, dtype="float64")
+    rows = quantiles.iloc[:len(values)]
+    return (
+        values * np.exp(rows[f"Lower_{label}"].to_numpy()),
+        values * np.exp(rows[f"Upper_{label}"].to_numpy()),
+    )
+
+
+def get_intervals(entry_dir, residuals, steps, method="conformal", coverages=COVERAGES):
+    """Horizon quantiles stored inside a forecast cache entry.
+
+    The file name carries a digest of the residuals and settings, so new
+    backtest residuals produce a new table while an unchanged request is a
+    single Feather read. The table is only stored once the forecast itself
+    has created ``entry_dir``; creating the directory here would make the
+    forecast's own atomic rename into it fail.
+    """
+    residuals = np.ascontiguousarray(residuals, dtype="float64")
+    digest = hashlib.sha256(residuals.tobytes())
+    digest.update(repr((steps, method, tuple(coverages))).encode())
+    path = os.path.join(entry_dir, f"intervals-{digest.hexdigest()[:16]}.feather")
+
+    if os.path.exists(path):
+        return pd.read_feather(path)
+
+    quantiles = horizon_quantiles(residuals, steps, coverages, method)
+    if not os.path.isdir(entry_dir):
+        return quantiles
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    quantiles.to_feather(tmp_path)
+    os.replace(tmp_path, path)
+    return quantiles
@@ -0,0 +1,90 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from services.scenarios import net_profit
+
+METHODS = ("gbm", "bootstrap")
+CHUNK_BYTES = 32 * 2**20
+
+
+def _increments(rng, log_returns, n, horizon, method, block):
+    """(n x horizon) daily log increments for one chunk of paths."""
+    if method == "gbm":
+        mu, sigma = log_returns.mean(), log_returns.std(ddof=1)
+        return rng.standard_normal((n, horizon)) * sigma + mu
+
+    # Fixed-length blocks of consecutive history keep volatility
+    # clustering and short-range autocorrelation inside each block.
+    block = min(block, len(log_returns))
+    n_blocks = -(-horizon // block)
+    starts = rng.integers(0, len(log_returns) - block + 1, size=(n, n_blocks))
+    index = (starts[:, :, None] + np.arange(block)).reshape(n, -1)[:, :horizon]
+    return log_returns[index]
+
+
+def _simulate_chunk(args):
+    log_returns, start_price, n, horizon, method, block, seed = args
+    rng = np.random.default_rng(seed)
+    path = np.cumsum(_increments(rng, log_returns, n, horizon, method, block), axis=1)
+    terminal = start_price * np.exp(path[:, -1])
+    peak = start_price * np.exp(np.maximum(path.max(axis=1), 0.0))
+    return terminal, peak
+
+
+def simulate_prices(log_returns, start_price, horizon, n_paths=100_000, method="gbm",
+                    block=10, seed=42, workers=1, chunk_bytes=CHUNK_BYTES):
+    """Terminal and highest price of ``n_paths`` simulated price paths.
+
+    ``"gbm"`` draws normal log returns with the historical mean and
+    volatility; ``"bootstrap"`` resamples blocks of ``block`` consecutive
+    historical log returns. Paths are generated in chunks of at most
+    ``chunk_bytes`` so memory stays bounded for any ``n_paths``, and only
+    two numbers per path are kept. Each chunk has its own child seed, so
+    the result is the same with or without the ``workers`` process pool.
+    """
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {METHODS}")
+    log_returns = np.asarray(log_returns, dtype="float64")
+    log_returns = log_returns[np.isfinite(log_returns)]
+
+    per_chunk = max(1, chunk_bytes // (3 * horizon * 8))
+    sizes = [min(per_chunk, n_paths - lo) for lo in range(0, n_paths, per_chunk)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [
+        (log_returns, start_price, n, horizon, method, block, s)
+        for n, s in zip(sizes, seeds)
+    ]
+
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_simulate_chunk, tasks))
+    else:
+        results = [_simulate_chunk(task) for task in tasks]
+
+    terminal, peak = (np.concatenate(parts) for parts in zip(*results))
+    return terminal, peak
+
+
+def risk_summary(terminal, peak, buy_price, quantity, fees_pct, target_price,
+                 confidence=0.95):
+    """P&L distribution statistics for holding ``quantity`` to the horizon.
+
+    VaR is the loss not exceeded with ``confidence``; CVaR is the average
+    loss beyond it. The target is hit when a path's highest price reaches
+    ``target_price`` at any point, not only at the horizon.
+    """
+    pnl, _ = net_profit(buy_price, terminal, quantity, fees_pct)
+    cutoff = np.quantile(pnl, 1 - confidence)
+    return {
+        "pnl": pnl,
+        "Expected_PnL": pnl.mean(),
+        "Median_PnL": np.median(pnl),
+        "Prob_Profit": (pnl > 0).mean(),
+        "Prob_Hit_Target": (peak >= target_price).mean(),
+        "Prob_Above_Target_At_End": (terminal >= target_price).mean(),
+        "VaR": -cutoff,
+        "CVaR": -pnl[pnl <= cutoff].mean(),
+    }
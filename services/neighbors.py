@@ -0,0 +1,131 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from services.correlation import PairwiseCorrelationEngine
+
+INDEX_PATH = os.path.join("dataset", "correlation_neighbors.csv")
+DEFAULT_K = 10
+
+KINDS = ("positive", "negative", "least")
+
+
+def returns_fingerprint(returns):
+    """Hash of the return matrix; the index is stale when this changes."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([str(c) for c in returns.columns]).encode())
+    digest.update(np.ascontiguousarray(returns.index.asi8).tobytes())
+    digest.update(np.ascontiguousarray(returns.to_numpy(dtype="float64")).tobytes())
+    return digest.hexdigest()
+
+
+def _top_k(scores, k):
+    """Row indices of the ``k`` smallest scores in each column, sorted."""
+    k = min(k, len(scores))
+    part = np.argpartition(scores, k - 1, axis=0)[:k]
+    order = np.take_along_axis(scores, part, axis=0).argsort(axis=0, kind="stable")
+    return np.take_along_axis(part, order, axis=0)
+
+
+def build_neighbor_index(returns, k=DEFAULT_K, block_size=256):
+    """Long-form top-k neighbour table for every coin.
+
+    For each Base_Coin holds the ``k`` most positive, the ``k`` most
+    negative and the ``k`` least absolute pairwise-complete correlations.
+    Columns are processed ``block_size`` coins at a time with
+    ``argpartition``, so memory is O(N * block_size) rather than N x N.
+    """
+    symbols = list(returns.columns)
+    engine = PairwiseCorrelationEngine(symbols, returns)
+    k = min(k, len(symbols) - 1)
+
+    frames = []
+    for start in range(0, len(symbols), block_size):
+        cols = np.arange(start, min(start + block_size, len(symbols)))
+        corr = engine.block(cols)
+        corr[cols, np.arange(len(cols))] = np.nan
+
+        missing = np.isnan(corr)
+        scores = {
+            "positive": np.where(missing, np.inf, -corr),
+            "negative": np.where(missing, np.inf, corr),
+            "least": np.where(missing, np.inf, np.abs(corr)),
+        }
+
+        for kind in KINDS:
+            idx = _top_k(scores[kind], k)
+            values = np.take_along_axis(corr, idx, axis=0)
+            frames.append(pd.DataFrame({
+                "Base_Coin": np.repeat(np.array(symbols)[cols], k),
+                "Kind": kind,
+                "Rank": np.tile(np.arange(1, k + 1), len(cols)),
+                "Related_Coin": np.array(symbols)[idx.T.ravel()],
+                "Correlation": values.T.ravel(),
+            }))
+
+    index = pd.concat(frames, ignore_index=True)
+    return index[index["Correlation"].notna()].reset_index(drop=True)
+
+
+def _meta_path(path):
+    return os.path.splitext(path)[0] + ".json"
+
+
+def load_or_build_index(returns, path=INDEX_PATH, k=DEFAULT_K):
+    """Read the persisted index, rebuilding it only if the returns changed."""
+    fingerprint = returns_fingerprint(returns)
+    meta_path = _meta_path(path)
+
+    if os.path.exists(path) and os.path.exists(meta_path):
+        with open(meta_path) as fh:
+            meta = json.load(fh)
+        if meta.get("returns_sha256") == fingerprint and meta.get("k", 0) >= k:
+            return pd.read_csv(path)
+
+    index = build_neighbor_index(returns, k)
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    index.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    with open(meta_path, "w") as fh:
+        json.dump({"returns_sha256": fingerprint, "k": k}, fh)
+
+    return index
+
+
+def column_neighbors(corr, k=4):
+    """Top-k tables of each kind for one coin's correlation Series."""
+    corr = corr.dropna()
+    values = corr.to_numpy()
+    scores = {"positive": -values, "negative": values, "least": np.abs(values)}
+
+    tables = {}
+    for kind in KINDS:
+        idx = _top_k(scores[kind][:, None], k)[:, 0] if len(values) else []
+        tables[kind] = pd.DataFrame({
+            "Related_Coin": corr.index[idx],
+            "Correlation": values[idx],
+        })
+    return tables
+
+
+class NeighborIndex:
+    """O(k) neighbour lookups over a loaded index table."""
+
+    def __init__(self, index):
+        self._groups = {
+            key: group[["Related_Coin", "Correlation"]].reset_index(drop=True)
+            for key, group in index.groupby(["Base_Coin", "Kind"], sort=False)
+        }
+
+    def lookup(self, symbol, kind, k=4):
+        group = self._groups.get((symbol, kind))
+        if group is None:
+            return pd.DataFrame(columns=["Related_Coin", "Correlation"])
+        return group.head(k)
+
+    def neighbors(self, symbol, k=4):
+        return {kind: self.lookup(symbol, kind, k) for kind in KINDS}
@@ -0,0 +1,208 @@
+import asyncio
+import calendar
+import logging
+import os
+import sqlite3
+import threading
+import time
+import urllib.request
+
+NEWS_DB_PATH = "dataset/.cache/news.sqlite"
+DEFAULT_FEEDS = ("https://news.google.com/rss/search?q=cryptocurrency",)
+# Comma-separated URLs or local file paths, e.g. a saved RSS file for
+# working offline.
+FEEDS_ENV = "CRYPTO_NEWS_FEEDS"
+
+FETCH_TIMEOUT = 10.0
+REFRESH_INTERVAL = 15 * 60
+RETRY_DELAY = 60
+RETENTION = 7 * 24 * 3600
+
+log = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id TEXT PRIMARY KEY,
+    feed TEXT NOT NULL,
+    title TEXT,
+    summary TEXT,
+    link TEXT,
+    published REAL,
+    fetched_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_published ON entries (published);
+CREATE TABLE IF NOT EXISTS feeds (
+    url TEXT PRIMARY KEY,
+    fetched_at REAL NOT NULL,
+    entries INTEGER,
+    error TEXT,
+    failed_at REAL
+);
+"""
+
+
+def configured_feeds():
+    value = os.environ.get(FEEDS_ENV, "")
+    feeds = tuple(url.strip() for url in value.split(",") if url.strip())
+    return feeds or DEFAULT_FEEDS
+
+
+def _connect(path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    # WAL lets the page read while the ingester writes.
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_SCHEMA)
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(feeds)")}
+    if "failed_at" not in columns:
+        conn.execute("ALTER TABLE feeds ADD COLUMN failed_at REAL")
+    return conn
+
+
+def fetch_feed(url, timeout=FETCH_TIMEOUT):
+    """Parsed entries of one feed; ``url`` may also be a local file path.
+
+    The download goes through urllib with a timeout because
+    ``feedparser.parse(url)`` has none and can hang on a slow server.
+    """
+    import feedparser
+
+    if os.path.exists(url):
+        with open(url, "rb") as fh:
+            content = fh.read()
+    else:
+        request = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0"})
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            content = response.read()
+
+    feed = feedparser.parse(content)
+    if feed.bozo and not feed.entries:
+        raise ValueError(f"unreadable feed: {feed.bozo_exception}")
+    return feed.entries
+
+
+def _entry_row(url, entry, now):
+    published = entry.get("published_parsed") or entry.get("updated_parsed")
+    return (
+        entry.get("id") or entry.get("link") or entry.get("title", ""),
+        url,
+        entry.get("title", ""),
+        entry.get("summary", ""),
+        entry.get("link", ""),
+        calendar.timegm(published) if published else None,
+        now,
+    )
+
+
+def store_entries(path, url, entries=None, error=None):
+    """Upsert one feed's entries, record the fetch and drop expired rows.
+
+    A failed fetch only records ``error`` and ``failed_at``; ``fetched_at``
+    keeps the last success, so the feed is retried after ``RETRY_DELAY``
+    rather than a full refresh interval.
+    """
+    now = time.time()
+    with _connect(path) as conn:
+        if error is not None:
+            conn.execute(
+                "INSERT INTO feeds (url, fetched_at, entries, error, failed_at) "
+                "VALUES (?, 0, 0, ?, ?) "
+                "ON CONFLICT (url) DO UPDATE SET error = excluded.error, "
+                "failed_at = excluded.failed_at",
+                (url, error, now),
+            )
+        else:
+            conn.executemany(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [_entry_row(url, entry, now) for entry in entries or ()],
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO feeds VALUES (?, ?, ?, NULL, NULL)",
+                (url, now, len(entries or ())),
+            )
+        conn.execute(
+            "DELETE FROM entries WHERE COALESCE(published, fetched_at) < ?",
+            (now - RETENTION,),
+        )
+    conn.close()
+
+
+def stale_feeds(path, urls, ttl=REFRESH_INTERVAL, retry_delay=RETRY_DELAY):
+    """The feeds in ``urls`` not fetched within the last ``ttl`` seconds,
+    leaving out those that failed within the last ``retry_delay``."""
+    with _connect(path) as conn:
+        rows = conn.execute("SELECT url, fetched_at, failed_at FROM feeds").fetchall()
+    conn.close()
+    status = {url: (fetched_at, failed_at or 0) for url, fetched_at, failed_at in rows}
+    now = time.time()
+    due = []
+    for url in urls:
+        fetched_at, failed_at = status.get(url, (0, 0))
+        if now - fetched_at >= ttl and now - failed_at >= retry_delay:
+            due.append(url)
+    return due
+
+
+async def refresh_feeds(urls, path=NEWS_DB_PATH, timeout=FETCH_TIMEOUT):
+    """Fetch every feed concurrently and store what arrives.
+
+    Each fetch runs in a worker thread under its own deadline, so one hung
+    server cannot hold up the others. Failures are stored as the feed's
+    error and its previous entries stay readable.
+    """
+    async def fetch(url):
+        try:
+            entries = await asyncio.wait_for(
+                asyncio.to_thread(fetch_feed, url, timeout), timeout + 1
+            )
+        except Exception as exc:
+            return url, None, f"{type(exc).__name__}: {exc}"
+        return url, entries, None
+
+    results = await asyncio.gather(*(fetch(url) for url in urls))
+    for url, entries, error in results:
+        store_entries(path, url, entries, error)
+    return {url: error for url, _, error in results}
+
+
+def start_ingester(urls, path=NEWS_DB_PATH, interval=REFRESH_INTERVAL, timeout=FETCH_TIMEOUT):
+    """Refresh stale feeds now and then every ``interval`` seconds.
+
+    Runs an asyncio loop on a daemon thread and returns the thread. Only
+    feeds older than ``interval`` are fetched, so restarts and several app
+    processes sharing one store do not refetch fresh feeds. An error in one
+    round (a locked or unwritable store, say) is logged and the next round
+    runs as usual.
+    """
+    async def loop():
+        while True:
+            try:
+                due = stale_feeds(path, urls, interval)
+                if due:
+                    await refresh_feeds(due, path, timeout)
+            except Exception:
+                log.exception("news refresh failed")
+            await asyncio.sleep(min(interval, RETRY_DELAY))
+
+    thread = threading.Thread(
+        target=asyncio.run, args=(loop(),), name="news-ingester", daemon=True
+    )
+    thread.start()
+    return thread
+
+
+def read_entries(path=NEWS_DB_PATH, limit=8):
+    """Newest stored entries and the per-feed fetch status, without any I/O
+    beyond the local store."""
+    if not os.path.exists(path):
+        return [], []
+    with _connect(path) as conn:
+        conn.row_factory = sqlite3.Row
+        entries = conn.execute(
+            "SELECT title, summary, link, published FROM entries "
+            "ORDER BY COALESCE(published, fetched_at) DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+        feeds = conn.execute("SELECT url, fetched_at, entries, error FROM feeds").fetchall()
+    conn.close()
+    return [dict(row) for row in entries], [dict(row) for row in feeds]
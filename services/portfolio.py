@@ -0,0 +1,114 @@
+import numpy as np
+
+FRONTIER_POINTS = 30
+
+
+def horizon_covariance(returns, horizon, lookback=365):
+    """Covariance of ``horizon``-day returns from a Date x coin return frame.
+
+    Daily returns over the last ``lookback`` days (rows with any gap
+    dropped) are assumed independent from day to day, so the daily
+    covariance scales linearly with the horizon.
+    """
+    daily = returns.iloc[-lookback:] if lookback else returns
+    n = returns.shape[1]
+    return np.cov(daily.dropna().to_numpy(), rowvar=False, ddof=1).reshape(n, n) * horizon
+
+
+def _solve_free(cov, mu, free, target, budget):
+    """Minimum-variance weights on the ``free`` assets with ``mu'w == target``
+    (and ``sum(w) == 1`` when the budget is active), plus the multipliers.
+    """
+    k = len(free)
+    rows = [mu[free]] + ([np.ones(k)] if budget else [])
+    A = np.vstack(rows)
+    kkt = np.block([[2 * cov[np.ix_(free, free)], -A.T], [A, np.zeros((len(rows), len(rows)))]])
+    rhs = np.concatenate([np.zeros(k), [target] + ([1.0] if budget else [])])
+    try:
+        solution = np.linalg.solve(kkt, rhs)
+    except np.linalg.LinAlgError:
+        solution = np.linalg.lstsq(kkt, rhs, rcond=None)[0]
+    w = np.zeros(len(mu))
+    w[free] = solution[:k]
+    lam_return = solution[k]
+    # The budget row enters the stationarity condition as -(-lam) = +lam.
+    lam_budget = -solution[k + 1] if budget else 0.0
+    return w, lam_return, lam_budget
+
+
+def min_risk_weights(mu, cov, target_return, tol=1e-12):
+    """Least-variance long-only weights with ``mu'w >= target_return``.
+
+    Weights may sum to less than one (the rest is cash). Solved exactly by
+    a primal active-set method: the working set holds the assets pinned at
+    zero and, when binding, the full-investment budget; each iteration is
+    one small KKT solve over the free assets. It starts from the whole
+    target in the best asset and usually finishes after a few active-set
+    changes, so 30 coins take a millisecond or two and hundreds of assets
+    remain interactive. Returns None when even the best asset falls short.
+    """
+    mu = np.asarray(mu, dtype="float64")
+    cov = np.asarray(cov, dtype="float64")
+    n = len(mu)
+    best = int(np.argmax(mu))
+    if target_return > mu[best] + tol:
+        return None
+    if target_return <= 0:
+        return np.zeros(n)
+
+    w = np.zeros(n)
+    w[best] = target_return / mu[best]
+    free = np.zeros(n, dtype=bool)
+    free[best] = True
+    budget = abs(w.sum() - 1) < tol
+
+    for _ in range(20 * n + 20):
+        candidate, lam_return, lam_budget = _solve_free(
+            cov, mu, np.flatnonzero(free), target_return, budget
+        )
+        step = candidate - w
+
+        if np.abs(step).max() < 1e-12:
+            # Stationary on the working set: release the constraint with
+            # the most negative multiplier, or stop at the optimum.
+            reduced = 2 * cov @ w - lam_return * mu + lam_budget
+            reduced[free] = np.inf
+            j = int(np.argmin(reduced))
+            if budget and lam_budget < min(reduced[j], 0) - tol:
+                budget = False
+            elif reduced[j] < -tol:
+                free[j] = True
+            else:
+                return w
+            continue
+
+        # Move towards the candidate until a zero bound or the budget blocks.
+        alpha, blocking = 1.0, None
+        shrinking = free & (step < -tol)
+        if shrinking.any():
+            ratios = np.full(n, np.inf)
+            ratios[shrinking] = -w[shrinking] / step[shrinking]
+            j = int(np.argmin(ratios))
+            if ratios[j] < alpha:
+                alpha, blocking = ratios[j], j
+        growth = step.sum()
+        if not budget and growth > tol:
+            ratio = (1 - w.sum()) / growth
+            if ratio < alpha:
+                alpha, blocking = ratio, "budget"
+
+        w = np.maximum(w + alpha * step, 0.0)
+        if blocking == "budget":
+            budget = True
+        elif blocking is not None:
+            free[blocking] = False
+            w[blocking] = 0.0
+    return w
+
+
+def efficient_frontier(mu, cov, points=FRONTIER_POINTS):
+    """(targets, weights) of least-variance portfolios from zero up to the
+    best asset's expected return."""
+    mu = np.asarray(mu, dtype="float64")
+    targets = np.linspace(0, max(mu.max(), 0), points + 1)[1:]
+    return targets, np.array([min_risk_weights(mu, cov, t) for t in targets])
@@ -0,0 +1,102 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+RULES_PATH = "dataset/exchange_rules.csv"
+
+MIN_NOTIONAL = 5.0
+# (minimum order value, fee rate) taker tiers, cheapest for the largest orders.
+FEE_TIERS = (
+    (0.0, 0.0060),
+    (10_000.0, 0.0040),
+    (50_000.0, 0.0025),
+    (100_000.0, 0.0020),
+    (1_000_000.0, 0.0015),
+)
+
+
+def default_lot_size(price):
+    """Quantity step worth at most about one unit of currency.
+
+    Mirrors how exchanges size steps (BTC 0.00001, ETH 0.0001, BNB 0.001,
+    DOGE and SHIB whole units): the power of ten at or below ``1 / price``,
+    capped at one unit and at 1e-8.
+    """
+    price = np.asarray(price, dtype="float64")
+    with np.errstate(divide="ignore"):
+        exponent = np.floor(np.log10(1.0 / price))
+    return 10.0 ** np.clip(exponent, -8, 0)
+
+
+def load_rules(coins, prices, path=RULES_PATH):
+    """Lot size and minimum notional for each coin.
+
+    Defaults come from ``default_lot_size`` and ``MIN_NOTIONAL``; an
+    optional CSV with Coin, Lot_Size and Min_Notional columns overrides
+    them per coin.
+    """
+    rules = pd.DataFrame({
+        "Lot_Size": default_lot_size(prices),
+        "Min_Notional": MIN_NOTIONAL,
+    }, index=pd.Index(coins, name="Coin"))
+    if os.path.exists(path):
+        overrides = pd.read_csv(path).drop_duplicates("Coin").set_index("Coin")
+        rules.update(overrides.reindex(rules.index)[["Lot_Size", "Min_Notional"]])
+    return rules
+
+
+def fee_rate(notional, tiers=FEE_TIERS):
+    thresholds = np.array([t[0] for t in tiers])
+    rates = np.array([t[1] for t in tiers])
+    return rates[np.searchsorted(thresholds, notional, side="right") - 1]
+
+
+def round_to_lots(units, lot_size):
+    """Largest whole number of lots not above ``units``."""
+    lots = np.floor(np.asarray(units) / lot_size * (1 + 1e-12))
+    return lots * lot_size
+
+
+def size_orders(capital, price, forecast_price, lot_size, min_notional, tiers=FEE_TIERS):
+    """Largest placeable buy for every row, with fees on both legs.
+
+    All arguments broadcast. For each fee tier the quantity that spends the
+    capital at that tier's rate is rounded down to whole lots; the
+    candidate whose own notional falls in a tier it can afford is kept,
+    so the tier lookup and the capital limit are settled for every row in
+    one (rows x tiers) pass. Orders below one lot or under the minimum
+    notional are marked not placeable and sized to zero.
+    """
+    capital, price, forecast_price, lot_size, min_notional = np.broadcast_arrays(
+        *(np.asarray(a, dtype="float64") for a in (capital, price, forecast_price, lot_size, min_notional))
+    )
+    rates = np.array([t[1] for t in tiers])
+
+    candidates = round_to_lots(
+        capital[..., None] / (price[..., None] * (1 + rates)), lot_size[..., None]
+    )
+    notional = candidates * price[..., None]
+    affordable = notional * (1 + fee_rate(notional, tiers)) <= capital[..., None] * (1 + 1e-12)
+    units = np.where(affordable, candidates, 0.0).max(axis=-1)
+
+    notional = units * price
+    placeable = (units >= lot_size) & (notional >= min_notional)
+    units = np.where(placeable, units, 0.0)
+    notional = units * price
+
+    rate = fee_rate(notional, tiers)
+    fees = rate * (notional + units * forecast_price)
+    net_profit = units * (forecast_price - price) - fees
+    with np.errstate(invalid="ignore", divide="ignore"):
+        net_return = np.where(notional > 0, net_profit / notional * 100, np.nan)
+
+    return pd.DataFrame({
+        "Units": units,
+        "Notional": notional,
+        "Fee_Rate_%": rate * 100,
+        "Fees": fees,
+        "Net_Profit": net_profit,
+        "Net_Return_%": net_return,
+        "Placeable": placeable,
+    })
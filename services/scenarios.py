@@ -0,0 +1,35 @@
+import numpy as np
+
+
+def net_profit(buy, sell, quantity, fees_pct):
+    """Net profit and return (%) of buying ``quantity`` at ``buy`` and
+    selling at ``sell``, with ``fees_pct`` charged on the purchase value.
+
+    Arguments broadcast against each other, so scalars give one scenario
+    and arrays give any number of them at once.
+    """
+    cost = np.multiply(buy, quantity)
+    net = np.multiply(np.subtract(sell, buy), quantity) - cost * np.divide(fees_pct, 100)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pct = net / cost * 100
+    return net, pct
+
+
+def scenario_grid(buys, sells, quantities, fees_pct, dtype="float32"):
+    """Net profit for every (buy, sell, quantity, fee) combination.
+
+    Returns a (buys x sells x quantities x fees) array. Each axis is
+    reshaped to its own dimension and the profit is written as
+    ``quantity * (sell - buy * (1 + fee))``, so the whole grid is one
+    broadcast expression with a single full-size temporary.
+    """
+    buy, sell, quantity, fee = np.ix_(*(
+        np.asarray(axis, dtype=dtype) for axis in (buys, sells, quantities, fees_pct)
+    ))
+    return quantity * (sell - buy * (1 + fee / 100))
+
+
+def break_even_surface(buys, fees_pct):
+    """(buys x fees) sell price at which a trade exactly covers its fees."""
+    buys = np.asarray(buys, dtype="float64")
+    return buys[:, None] * (1 + np.asarray(fees_pct, dtype="float64")[None, :] / 100)
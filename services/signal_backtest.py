@@ -0,0 +1,182 @@
+import numpy as np
+import pandas as pd
+
+from services.trading_signals import SIGNAL_THRESHOLD
+
+PERIODS_PER_YEAR = 365
+MEMORY_BUDGET = 64 * 2**20
+
+METRIC_COLUMNS = ["Total_Return_%", "Sharpe", "Max_Drawdown_%", "Trades", "Exposure_%"]
+
+
+def forecast_horizon(predictions):
+    """Longest ex-ante forecast path stored for any walk-forward fold, in bars."""
+    paths = predictions.dropna(subset=["Forecast"])
+    if paths.empty:
+        return 0
+    return int(paths.groupby(["Model", "Coin", "Fold"], sort=False).size().max())
+
+
+def historical_signals(predictions, closes, horizon, threshold=SIGNAL_THRESHOLD):
+    """Date x (Model, Coin) matrix of the signals the models gave in the past.
+
+    Each walk-forward fold contributes one decision on the last bar before
+    its origin: the ex-ante ``Forecast`` ``horizon`` bars ahead against
+    that bar's close, bucketed exactly like ``generate_signals`` (+1 BUY,
+    -1 SELL, 0 HOLD). Bars without a decision are NaN. ``closes`` is the
+    Date x Symbol close matrix the predictions were made from.
+    """
+    step = predictions.groupby(["Model", "Coin", "Fold"], sort=False).cumcount()
+    origin = predictions[step == 0]
+    target = predictions[step == horizon - 1]
+    decisions = origin[["Model", "Coin", "Fold", "Date"]].merge(
+        target[["Model", "Coin", "Fold", "Forecast"]], on=["Model", "Coin", "Fold"]
+    )
+
+    row = closes.index.get_indexer(decisions["Date"]) - 1
+    col = closes.columns.get_indexer(decisions["Coin"])
+    known = (row >= 0) & (col >= 0)
+    decisions, row, col = decisions[known], row[known], col[known]
+
+    expected = (decisions["Forecast"].to_numpy() / closes.to_numpy()[row, col] - 1) * 100
+    signal = np.select([expected > threshold, expected < -threshold], [1.0, -1.0], default=0.0)
+
+    series = pd.MultiIndex.from_frame(decisions[["Model", "Coin"]].drop_duplicates())
+    matrix = np.full((len(closes), len(series)), np.nan)
+    matrix[row, series.get_indexer(pd.MultiIndex.from_frame(decisions[["Model", "Coin"]]))] = signal
+    return pd.DataFrame(matrix, index=closes.index, columns=series)
+
+
+def signal_positions(signals, closes, horizon, allow_short=False):
+    """Positions and bar returns for replaying ``historical_signals``.
+
+    A decision on bar ``t`` holds for bars ``t + 1 .. t + horizon``; HOLD
+    and bars outside any holding window are flat. Without ``allow_short``
+    a SELL means staying out of the market. Both frames start at the
+    first decision so idle history does not dilute the statistics.
+    """
+    positions = signals.shift(1).ffill(limit=horizon - 1).fillna(0.0)
+    if not allow_short:
+        positions = positions.clip(lower=0.0)
+
+    coins = signals.columns.get_level_values("Coin")
+    returns = closes.pct_change(fill_method=None)[coins].fillna(0.0)
+    returns.columns = signals.columns
+
+    decided = signals.notna().any(axis=1).to_numpy()
+    first = int(decided.argmax()) if decided.any() else len(signals)
+    return positions.iloc[first:], returns.iloc[first:]
+
+
+def _parameter_grid(fees, slippages, sizes):
+    fee, slippage, size = (
+        a.ravel() for a in np.meshgrid(
+            np.atleast_1d(np.asarray(fees, dtype="float64")),
+            np.atleast_1d(np.asarray(slippages, dtype="float64")),
+            np.atleast_1d(np.asarray(sizes, dtype="float64")),
+            indexing="ij",
+        )
+    )
+    return fee, slippage, size
+
+
+def _daily_returns(held, turnover, cost, size):
+    """(grid, bars, series) strategy returns; costs are charged on turnover.
+
+    A bar can lose at most everything, which keeps the log equity finite.
+    """
+    daily = size[:, None, None] * (held[None] - cost[:, None, None] * turnover[None])
+    return np.maximum(daily, -1 + 1e-6)
+
+
+def simulate(positions, returns, fees=0.001, slippages=0.0005, sizes=1.0,
+             periods=PERIODS_PER_YEAR, budget=MEMORY_BUDGET):
+    """Metrics of every (fee, slippage, size) combination for every series.
+
+    ``positions`` and ``returns`` are aligned (bars x series) frames from
+    ``signal_positions``. Each bar earns ``size * position * return`` and
+    pays ``size * (fee + slippage)`` per unit of position change, so fee
+    and slippage only enter through their sum: the grid is reduced to its
+    unique (cost, size) pairs, evaluated as one broadcast array in chunks
+    of at most ``budget`` bytes, and expanded back. Returns one row per
+    combination and series.
+
+    The per-bar return is linear in the cost, so the Sharpe ratio comes
+    straight from per-series moments of the gross return and turnover
+    (the size cancels out). Only equity and drawdown need the full path,
+    which is accumulated in float32 to halve the memory traffic.
+    """
+    pos = positions.to_numpy()
+    held = pos * returns.to_numpy()
+    turnover = np.abs(np.diff(pos, axis=0, prepend=0.0))
+    n_bars, n_series = pos.shape
+
+    fee, slippage, size = _parameter_grid(fees, slippages, sizes)
+    pairs, inverse = np.unique(np.column_stack([fee + slippage, size]), axis=0, return_inverse=True)
+    inverse = inverse.ravel()
+
+    cost = pairs[:, :1]
+    mean = held.mean(axis=0) - cost * turnover.mean(axis=0)
+    variance = (
+        held.var(axis=0)
+        + cost**2 * turnover.var(axis=0)
+        - 2 * cost * ((held - held.mean(axis=0)) * (turnover - turnover.mean(axis=0))).mean(axis=0)
+    )
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sharpe = np.where(
+            variance > 1e-18, mean / np.sqrt(np.maximum(variance, 0)) * np.sqrt(periods), np.nan
+        )
+
+    held32, turnover32 = held.astype("float32"), turnover.astype("float32")
+    total = np.empty((len(pairs), n_series))
+    drawdown = np.empty((len(pairs), n_series))
+    chunk = max(1, budget // max(4 * n_bars * n_series * 4, 1))
+    for lo in range(0, len(pairs), chunk):
+        block = pairs[lo:lo + chunk].astype("float32")
+        daily = _daily_returns(held32, turnover32, block[:, 0], block[:, 1])
+        log_equity = np.log1p(daily, out=daily).cumsum(axis=1)
+        total[lo:lo + chunk] = np.expm1(log_equity[:, -1])
+        peak = np.maximum(np.maximum.accumulate(log_equity, axis=1), 0.0)
+        drawdown[lo:lo + chunk] = np.expm1((log_equity - peak).min(axis=1))
+
+    n_grid = len(fee)
+    series = positions.columns.to_frame(index=False)
+    out = series.loc[np.tile(np.arange(n_series), n_grid)].reset_index(drop=True)
+    out.insert(0, "Size", np.repeat(size, n_series))
+    out.insert(0, "Slippage", np.repeat(slippage, n_series))
+    out.insert(0, "Fee", np.repeat(fee, n_series))
+    out["Total_Return_%"] = (total[inverse] * 100).ravel().round(2)
+    out["Sharpe"] = sharpe[inverse].ravel().round(3)
+    out["Max_Drawdown_%"] = (drawdown[inverse] * 100).ravel().round(2)
+    out["Trades"] = np.tile((turnover > 0).sum(axis=0), n_grid)
+    out["Exposure_%"] = np.tile((pos != 0).mean(axis=0) * 100, n_grid).round(1)
+    return out
+
+
+def equity_curves(positions, returns, fee=0.001, slippage=0.0005, size=1.0):
+    """Bars x series equity (starting at 1) and drawdown for one setting."""
+    pos = positions.to_numpy()
+    turnover = np.abs(np.diff(pos, axis=0, prepend=0.0))
+    daily = _daily_returns(
+        pos * returns.to_numpy(), turnover, np.array([fee + slippage]), np.array([size])
+    )[0]
+    log_equity = np.log1p(daily).cumsum(axis=0)
+    peak = np.maximum(np.maximum.accumulate(log_equity, axis=0), 0.0)
+    equity = pd.DataFrame(np.exp(log_equity), index=positions.index, columns=positions.columns)
+    drawdown = pd.DataFrame(np.expm1(log_equity - peak), index=positions.index, columns=positions.columns)
+    return equity, drawdown
+
+
+def backtest_signals(predictions, closes, horizons, fees=0.001, slippages=0.0005, sizes=1.0,
+                     threshold=SIGNAL_THRESHOLD, allow_short=False):
+    """``simulate`` for every horizon, with a Horizon column ("7D", ...)."""
+    frames = []
+    for horizon in horizons:
+        signals = historical_signals(predictions, closes, horizon, threshold)
+        if signals.empty:
+            continue
+        positions, returns = signal_positions(signals, closes, horizon, allow_short)
+        metrics = simulate(positions, returns, fees, slippages, sizes)
+        metrics.insert(0, "Horizon", f"{horizon}D")
+        frames.append(metrics)
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
@@ -0,0 +1,148 @@
+import numpy as np
+
+
+def _previous(values):
+    """``values`` shifted one step along the last axis, NaN-padded."""
+    out = np.full(values.shape, np.nan)
+    out[..., 1:] = values[..., :-1]
+    return out
+
+
+def _as_last_axis(values, axis):
+    return np.moveaxis(np.asarray(values, dtype="float64"), axis, -1)
+
+
+def crossovers(fast, slow, axis=0):
+    """Bars where ``fast`` crosses above / below ``slow``.
+
+    Returns boolean ``(up, down)`` arrays shaped like the inputs. ``up`` is
+    ``fast > slow`` after ``fast <= slow`` on the previous bar, and
+    ``down`` the mirror image. Either input may be a scalar or broadcast
+    against the other, and any NaN on a bar or the bar before suppresses
+    the signal. ``axis`` is the time axis, so a (date x coin) matrix gets
+    every coin's signals in one pass.
+    """
+    fast, slow = np.broadcast_arrays(
+        np.asarray(fast, dtype="float64"), np.asarray(slow, dtype="float64")
+    )
+    fast, slow = _as_last_axis(fast, axis), _as_last_axis(slow, axis)
+    prev_fast, prev_slow = _previous(fast), _previous(slow)
+
+    up = (fast > slow) & (prev_fast <= prev_slow)
+    down = (fast < slow) & (prev_fast >= prev_slow)
+    return np.moveaxis(up, -1, axis), np.moveaxis(down, -1, axis)
+
+
+def threshold_breaks(values, upper=None, lower=None, axis=0):
+    """Bars where ``values`` breaks above ``upper`` / below ``lower``.
+
+    Thresholds may be scalars or arrays that broadcast against
+    ``values`` (one per coin, or one per bar). Returns ``(above, below)``;
+    a side whose threshold is None is all False.
+    """
+    values = np.asarray(values, dtype="float64")
+    none = np.zeros(values.shape, dtype=bool)
+    above = crossovers(values, upper, axis)[0] if upper is not None else none
+    below = crossovers(values, lower, axis)[1] if lower is not None else none
+    return above, below
+
+
+def _sparse_table(x, op):
+    """``table[k][..., i]`` is ``op`` over ``x[..., i:i + 2**k]``."""
+    table = [x]
+    width = 1
+    while 2 * width <= x.shape[-1]:
+        prev = table[-1]
+        table.append(op(prev[..., :-width], prev[..., width:]))
+        width *= 2
+    return table
+
+
+def _take(level, index):
+    return np.take_along_axis(level, index, axis=-1)
+
+
+def _prominence(x):
+    """Topographic prominence of every bar as a peak, along the last axis.
+
+    For bar ``i`` the nearest strictly higher bar on each side is found
+    by binary lifting over a sparse table of range maxima, and the base on
+    that side is the range minimum between them (or to the series edge).
+    The prominence is ``x[i]`` minus the higher of the two bases, as
+    ``scipy.signal.peak_prominences`` defines it, but computed for every
+    bar of every row with O(log n) whole-array steps.
+    """
+    n = x.shape[-1]
+    high = np.where(np.isnan(x), -np.inf, x)
+    low = np.where(np.isnan(x), np.inf, x)
+    maxima = _sparse_table(high, np.maximum)
+    minima = _sparse_table(low, np.minimum)
+    idx = np.broadcast_to(np.arange(n), x.shape)
+
+    def range_min(lo, hi):
+        # Minimum over the inclusive range [lo, hi].
+        k = np.floor(np.log2(hi - lo + 1)).astype("int64")
+        out = np.full(x.shape, np.inf)
+        for level in np.unique(k):
+            width = 1 << int(level)
+            sel = k == level
+            table = minima[level]
+            left = _take(table, np.where(sel, lo, 0))
+            right = _take(table, np.where(sel, hi - width + 1, 0))
+            out = np.where(sel, np.minimum(left, right), out)
+        return out
+
+    # Grow [left, right) around each bar over blocks that stay <= x[i];
+    # what is left outside is the nearest strictly higher bar (or the edge).
+    left = idx.copy()
+    right = idx + 1
+    for level in range(len(maxima) - 1, -1, -1):
+        width = 1 << level
+        table = maxima[level]
+
+        cand = left - width
+        ok = cand >= 0
+        block = _take(table, np.where(ok, cand, 0))
+        left = np.where(ok & (block <= high), cand, left)
+
+        ok = right + width <= n
+        block = _take(table, np.where(ok, right, 0))
+        right = np.where(ok & (block <= high), right + width, right)
+
+    left_base = range_min(left, idx)
+    right_base = range_min(idx, right - 1)
+    return x - np.maximum(left_base, right_base)
+
+
+def turning_points(values, prominence=0.0, relative=False, axis=0):
+    """Local minima and maxima, optionally filtered by prominence.
+
+    A turning point is strictly below (minimum) or above (maximum) both
+    neighbours; the first and last bars never qualify. With a
+    ``prominence`` only turning points that stand at least that far above
+    (or below) the surrounding terrain are kept, using the same
+    definition as ``scipy.signal.find_peaks``; with ``relative`` the
+    prominence is a fraction of the turning point's value, so one
+    threshold suits coins of any price scale. ``axis`` is the time axis,
+    so a (date x coin) matrix is handled in one pass. Returns boolean
+    ``(minima, maxima)``.
+    """
+    x = _as_last_axis(values, axis)
+    prev = _previous(x)
+    nxt = np.full(x.shape, np.nan)
+    nxt[..., :-1] = x[..., 1:]
+
+    minima = (x < prev) & (x < nxt)
+    maxima = (x > prev) & (x > nxt)
+
+    if prominence > 0 and x.shape[-1]:
+        peak = _prominence(x)
+        trough = _prominence(-x)
+        if relative:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                peak = peak / np.abs(x)
+                trough = trough / np.abs(x)
+        maxima &= peak >= prominence
+        minima &= trough >= prominence
+
+    return np.moveaxis(minima, -1, axis), np.moveaxis(maxima, -1, axis)
@@ -0,0 +1,314 @@
+import math
+
+import numpy as np
+
+
+class RunningMoments:
+    """Online count, mean, variance, skewness and kurtosis.
+
+    Single values are folded in with Welford's update extended to the
+    third and fourth central moments (Pebay, 2008); arrays are summarised
+    with NumPy and merged with the pairwise combination formulas, so both
+    paths avoid the cancellation of raw power sums. NaNs are ignored.
+    """
+
+    def __init__(self, values=None):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._m3 = 0.0
+        self._m4 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        if values is not None:
+            self.extend(values)
+
+    def update(self, x):
+        if x != x:
+            return
+        n1 = self.count
+        n = n1 + 1
+        delta = x - self.mean
+        delta_n = delta / n
+        delta_n2 = delta_n * delta_n
+        term1 = delta * delta_n * n1
+
+        self.mean += delta_n
+        self._m4 += (
+            term1 * delta_n2 * (n * n - 3 * n + 3)
+            + 6 * delta_n2 * self._m2
+            - 4 * delta_n * self._m3
+        )
+        self._m3 += term1 * delta_n * (n - 2) - 3 * delta_n * self._m2
+        self._m2 += term1
+        self.count = n
+        self.min = min(self.min, x)
+        self.max = max(self.max, x)
+
+    def extend(self, values):
+        values = np.asarray(values, dtype="float64")
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+
+        other = RunningMoments()
+        other.count = len(values)
+        other.mean = float(values.mean())
+        dev = values - other.mean
+        dev2 = dev * dev
+        other._m2 = float(dev2.sum())
+        other._m3 = float((dev2 * dev).sum())
+        other._m4 = float((dev2 * dev2).sum())
+        other.min = float(values.min())
+        other.max = float(values.max())
+        self.merge(other)
+
+    def merge(self, other):
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.__dict__.update(other.__dict__)
+            return
+
+        na, nb = self.count, other.count
+        n = na + nb
+        delta = other.mean - self.mean
+        delta2 = delta * delta
+
+        m2 = self._m2 + other._m2 + delta2 * na * nb / n
+        m3 = (
+            self._m3 + other._m3
+            + delta2 * delta * na * nb * (na - nb) / n ** 2
+            + 3 * delta * (na * other._m2 - nb * self._m2) / n
+        )
+        m4 = (
+            self._m4 + other._m4
+            + delta2 * delta2 * na * nb * (na * na - na * nb + nb * nb) / n ** 3
+            + 6 * delta2 * (na * na * other._m2 + nb * nb * self._m2) / n ** 2
+            + 4 * delta * (na * other._m3 - nb * self._m3) / n
+        )
+
+        self.mean += delta * nb / n
+        self._m2, self._m3, self._m4 = m2, m3, m4
+        self.count = n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self):
+        """Sample (ddof=1) variance."""
+        return self._m2 / (self.count - 1) if self.count > 1 else math.nan
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+    @property
+    def skewness(self):
+        """Bias-corrected sample skewness, as ``pandas.Series.skew``."""
+        n = self.count
+        if n < 3 or self._m2 == 0:
+            return math.nan
+        g1 = math.sqrt(n) * self._m3 / self._m2 ** 1.5
+        return g1 * math.sqrt(n * (n - 1)) / (n - 2)
+
+    @property
+    def kurtosis(self):
+        """Bias-corrected excess kurtosis, as ``pandas.Series.kurt``."""
+        n = self.count
+        if n < 4 or self._m2 == 0:
+            return math.nan
+        g2 = n * self._m4 / (self._m2 * self._m2) - 3
+        return ((n + 1) * g2 + 6) * (n - 1) / ((n - 2) * (n - 3))
+
+
+class RollingMoments:
+    """Trailing-window mean and standard deviation for any window length.
+
+    Keeps the values in a growing buffer, so appending a bar is O(1)
+    amortised and no per-window column has to be stored. A rolling series
+    for a new window length is built a block of ``block`` window ends at a
+    time: each block takes prefix sums of its own rows shifted by their
+    mean, so the sums never grow with the series length and rounding
+    depends only on the local spread. The latest window is a direct
+    two-pass over its ``window`` values. A window that contains a NaN
+    yields NaN, matching ``pandas.Series.rolling``.
+    """
+
+    def __init__(self, values=None, capacity=1024, block=256):
+        self._n = 0
+        self._values = np.empty(capacity)
+        self.block = block
+        if values is not None:
+            self.extend(values)
+
+    def __len__(self):
+        return self._n
+
+    def _reserve(self, extra):
+        needed = self._n + extra
+        if needed <= len(self._values):
+            return
+        new = np.empty(max(needed, 2 * len(self._values)))
+        new[:self._n] = self._values[:self._n]
+        self._values = new
+
+    def update(self, x):
+        self.extend([x])
+
+    def extend(self, values):
+        values = np.asarray(values, dtype="float64")
+        if len(values) == 0:
+            return
+        self._reserve(len(values))
+        self._values[self._n:self._n + len(values)] = values
+        self._n += len(values)
+
+    def _rolling(self, window, ddof):
+        """(mean, variance) of the window ending at every row."""
+        values = self._values[:self._n]
+        mean = np.full(self._n, np.nan)
+        var = np.full(self._n, np.nan)
+        block = max(self.block, window)
+
+        def prefix(x):
+            return np.concatenate(([0.0], np.cumsum(x)))
+
+        for lo in range(window, self._n + 1, block):
+            hi = min(lo + block, self._n + 1)
+            rows = values[lo - window:hi - 1]
+            valid = ~np.isnan(rows)
+            anchor = rows[valid].mean() if valid.any() else 0.0
+            dev = np.where(valid, rows - anchor, 0.0)
+            s1, s2, count = prefix(dev), prefix(dev * dev), prefix(valid)
+            end = np.arange(window, window + hi - lo)
+            w1 = s1[end] - s1[end - window]
+            w2 = s2[end] - s2[end - window]
+            full = count[end] - count[end - window] == window
+
+            mean[lo - 1:hi - 1] = np.where(full, w1 / window + anchor, np.nan)
+            spread = np.maximum(w2 - w1 * w1 / window, 0.0) / (window - ddof)
+            var[lo - 1:hi - 1] = np.where(full, spread, np.nan)
+        return mean, var
+
+    def mean_series(self, window):
+        return self._rolling(window, 1)[0]
+
+    def std_series(self, window, ddof=1):
+        return np.sqrt(self._rolling(window, ddof)[1])
+
+    def std(self, window, ddof=1):
+        """Standard deviation of the latest ``window`` values."""
+        if window < 1 or self._n < window:
+            return math.nan
+        latest = self._values[self._n - window:self._n]
+        if np.isnan(latest).any():
+            return math.nan
+        return float(latest.std(ddof=ddof))
+
+
+class P2Quantile:
+    """Streaming quantile estimate in O(1) memory (Jain & Chlamtac's P^2).
+
+    Tracks five markers whose heights approximate the minimum, p/2, p,
+    (1+p)/2 quantiles and the maximum, adjusting them with piecewise
+    parabolic interpolation as values arrive. Exact for the first five
+    observations.
+    """
+
+    def __init__(self, p):
+        self.p = p
+        self._heights = []
+        self._pos = [1.0, 2.0, 3.0, 4.0, 5.0]
+        self._desired = [1.0, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5.0]
+        self._step = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    def update(self, x):
+        if x != x:
+            return
+        h = self._heights
+        if len(h) < 5:
+            h.append(x)
+            h.sort()
+            return
+
+        if x < h[0]:
+            h[0] = x
+            k = 0
+        elif x >= h[4]:
+            h[4] = x
+            k = 3
+        else:
+            k = next(i for i in range(4) if h[i] <= x < h[i + 1])
+
+        pos = self._pos
+        for i in range(k + 1, 5):
+            pos[i] += 1
+        for i in range(5):
+            self._desired[i] += self._step[i]
+
+        for i in range(1, 4):
+            d = self._desired[i] - pos[i]
+            if (d >= 1 and pos[i + 1] - pos[i] > 1) or (d <= -1 and pos[i - 1] - pos[i] < -1):
+                d = 1 if d > 0 else -1
+                candidate = h[i] + d / (pos[i + 1] - pos[i - 1]) * (
+                    (pos[i] - pos[i - 1] + d) * (h[i + 1] - h[i]) / (pos[i + 1] - pos[i])
+                    + (pos[i + 1] - pos[i] - d) * (h[i] - h[i - 1]) / (pos[i] - pos[i - 1])
+                )
+                if not h[i - 1] < candidate < h[i + 1]:
+                    candidate = h[i] + d * (h[i + d] - h[i]) / (pos[i + d] - pos[i])
+                h[i] = candidate
+                pos[i] += d
+
+    def extend(self, values):
+        for x in np.asarray(values, dtype="float64"):
+            self.update(float(x))
+
+    @property
+    def value(self):
+        h = self._heights
+        if not h:
+            return math.nan
+        if len(h) < 5:
+            return float(np.quantile(h, self.p))
+        return h[2]
+
+
+class StreamingStats:
+    """Moments, rolling windows and quantiles of one series, updated per bar."""
+
+    QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+    def __init__(self, values=None, quantiles=QUANTILES):
+        self.moments = RunningMoments()
+        self.rolling = RollingMoments()
+        self.quantiles = {p: P2Quantile(p) for p in quantiles}
+        if values is not None:
+            self.extend(values)
+
+    def update(self, x):
+        self.moments.update(x)
+        self.rolling.update(x)
+        for estimator in self.quantiles.values():
+            estimator.update(x)
+
+    def extend(self, values):
+        values = np.asarray(values, dtype="float64")
+        self.moments.extend(values)
+        self.rolling.extend(values)
+        for estimator in self.quantiles.values():
+            estimator.extend(values)
+
+    def summary(self):
+        row = {
+            "count": self.moments.count,
+            "mean": self.moments.mean,
+            "std": self.moments.std,
+            "skew": self.moments.skewness,
+            "kurtosis": self.moments.kurtosis,
+            "min": self.moments.min,
+        }
+        for p, estimator in self.quantiles.items():
+            row[f"{p:.0%}"] = estimator.value
+        row["max"] = self.moments.max
+        return row
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+HORIZONS = (1, 7, 14, 30, 90)
+SIGNAL_THRESHOLD = 3.0
+
+CONFIDENCE_BINS = [0, 4, 8, np.inf]
+CONFIDENCE_LABELS = ["Low", "Medium", "High"]
+RISK_BINS = [0, 5, 10, np.inf]
+RISK_LABELS = ["Low Risk", "Medium Risk", "High Risk"]
+
+SIGNAL_COLUMNS = [
+    "Symbol", "Model", "Horizon", "Current_Price", "Forecast_Price", "Signal",
+    "Entry_Price", "Exit_Price", "Expected_Return_%", "Trend", "MA_Signal",
+    "Confidence", "Risk_Level",
+]
+
+
+def classify(expected_return):
+    """Confidence and risk buckets from the absolute expected return (%)."""
+    magnitude = np.abs(np.asarray(expected_return, dtype="float64"))
+    confidence = pd.cut(magnitude, CONFIDENCE_BINS, labels=CONFIDENCE_LABELS, right=False)
+    risk = pd.cut(magnitude, RISK_BINS, labels=RISK_LABELS, right=False)
+    return np.asarray(confidence, dtype=object), np.asarray(risk, dtype=object)
+
+
+def generate_signals(forecasts, latest, horizons=HORIZONS, threshold=SIGNAL_THRESHOLD):
+    """Signals for every (coin, model) forecast path and horizon at once.
+
+    ``forecasts`` has Symbol and Model columns followed by one column per
+    forecast day (day 1 first). ``latest`` is indexed by Symbol with the
+    last Close, SMA_7 and SMA_14. The selected horizons are gathered as
+    one (paths x horizons) block and every column of the output is a
+    whole-array expression over it. Trend and MA_Signal both follow the
+    SMA_7 / SMA_14 crossover state.
+    """
+    horizons = [h for h in horizons if h <= forecasts.shape[1] - 2]
+    paths = forecasts.iloc[:, 2:].to_numpy(dtype="float64")
+    symbols = np.repeat(forecasts["Symbol"].to_numpy(), len(horizons))
+    models = np.repeat(forecasts["Model"].to_numpy(), len(horizons))
+
+    forecast_price = paths[:, np.asarray(horizons) - 1].ravel()
+    features = latest.reindex(symbols)
+    current = features["Close"].to_numpy(dtype="float64")
+
+    expected = (forecast_price / current - 1) * 100
+    signal = np.select(
+        [expected > threshold, expected < -threshold], ["BUY", "SELL"], default="HOLD"
+    )
+    rising = (features["SMA_7"] > features["SMA_14"]).to_numpy()
+    trend = np.where(rising, "Uptrend", "Downtrend")
+    ma_signal = np.where(rising, "Bullish", "Bearish")
+    confidence, risk = classify(expected)
+
+    current = current.round(4)
+    forecast_price = forecast_price.round(4)
+    return pd.DataFrame({
+        "Symbol": symbols,
+        "Model": models,
+        "Horizon": np.tile([f"{h}D" for h in horizons], len(forecasts)),
+        "Current_Price": current,
+        "Forecast_Price": forecast_price,
+        "Signal": signal,
+        "Entry_Price": current,
+        "Exit_Price": forecast_price,
+        "Expected_Return_%": expected.round(2),
+        "Trend": trend,
+        "MA_Signal": ma_signal,
+        "Confidence": confidence,
+        "Risk_Level": risk,
+    }, columns=SIGNAL_COLUMNS)
@@ -1,8 +1,13 @@
+import os
+
 import streamlit as st
-import pandas as pd
 import plotly.express as px
 
-DATA_PATH = "dataset/main_crypto_dataset.csv"
+from services.cluster_sweep import SWEEP_PATH, summarise_sweep
+from services.csv_cache import read_csv_cached
+from services.data_store import get_correlation_engine
+from services.neighbors import column_neighbors
+
 PCA_PATH = "dataset/pca_components.csv"
 CLUSTER_PATH = "dataset/clustered_coins.csv"
 REPRESENTATIVE_PATH = "dataset/cluster_representatives.csv"
@@ -10,27 +15,80 @@ REPRESENTATIVE_PATH = "dataset/cluster_representatives.csv"
 NO_CORRELATION_COINS = []
 
 
-@st.cache_data
-def load_main_data():
-    return pd.read_csv(DATA_PATH, parse_dates=["Date"])
-
 @st.cache_data
 def load_pca_data():
-    return pd.read_csv(PCA_PATH)
+    return read_csv_cached(PCA_PATH)
 
 @st.cache_data
 def load_cluster_data():
-    return pd.read_csv(CLUSTER_PATH)
+    return read_csv_cached(CLUSTER_PATH)
 
 @st.cache_data
 def load_representatives():
-    return pd.read_csv(REPRESENTATIVE_PATH)
+    return read_csv_cached(REPRESENTATIVE_PATH)
+
+# Not st.cache_data: read_csv_cached already follows the file, and a
+# cached None would hide a sweep run while the app is up.
+def load_sweep_summary():
+    if not os.path.exists(SWEEP_PATH):
+        return None
+    results = read_csv_cached(SWEEP_PATH)
+    return summarise_sweep(results), results
+
+
+def render_k_selection(current_k):
+    st.subheader("Choosing the Number of Clusters")
+
+    sweep = load_sweep_summary()
+    if sweep is None:
+        st.info(
+            "No cluster sweep results found. Run "
+            "`python -m pipelines.cluster_sweep` to evaluate silhouette, "
+            "inertia and bootstrap stability for a range of k."
+        )
+        return
+
+    summary, results = sweep
+
+    metric = st.radio(
+        "Metric",
+        ["Silhouette", "Stability", "Inertia"],
+        horizontal=True,
+        key="cluster_sweep_metric"
+    )
+
+    fig_sweep = px.line(
+        summary,
+        x="K",
+        y=f"{metric}_mean",
+        error_y=f"{metric}_std",
+        markers=True,
+        title=f"{metric} by Number of Clusters (mean across seeds)"
+    )
+    st.plotly_chart(fig_sweep, use_container_width=True)
+
+    selected_k = st.select_slider(
+        "Inspect k",
+        options=summary["K"].tolist(),
+        value=current_k if current_k in set(summary["K"]) else summary["K"].iloc[0],
+        key="cluster_sweep_k"
+    )
+
+    st.dataframe(
+        results[results["K"] == selected_k].reset_index(drop=True),
+        use_container_width=True
+    )
+
+    st.caption(
+        "Stability is the mean adjusted Rand index between the full-data "
+        "clustering and clusterings fitted on bootstrap resamples; values "
+        "near 1 mean the partition is reproducible."
+    )
 
 
 def render():
     st.title("Clustering Analysis")
 
-    df = load_main_data()
     pca_df = load_pca_data()
     cluster_df = load_cluster_data()
     rep_df = load_representatives()
@@ -63,6 +121,8 @@ def render():
 
     st.plotly_chart(fig_cluster, use_container_width=True)
 
+    render_k_selection(len(rep_df))
+
  
     st.subheader("Correlation Insight (Representative Coins Only)")
 
@@ -84,26 +144,21 @@ def render():
         )
         return
 
-    returns_df = (
-        df.pivot(index="Date", columns="Symbol", values="Daily_Return")
-        .dropna(how="any")
-    )
+    # Dense correlation: only days on which every coin has a return.
+    engine = get_correlation_engine()
+    neighbors = column_neighbors(engine.column(selected_coin).drop(selected_coin))
 
-    if selected_coin not in returns_df.columns:
+    if neighbors["positive"].empty:
         st.warning("Selected coin not available for correlation analysis.")
         return
 
-    corr_series = returns_df.corr()[selected_coin].drop(selected_coin)
-
-    top_positive = corr_series.sort_values(ascending=False).head(4)
+    top_positive = neighbors["positive"]
 
-    negative_corr = corr_series[corr_series < 0].sort_values()
+    top_negative = neighbors["negative"]
 
-    if len(negative_corr) >= 4:
-        top_negative = negative_corr.head(4)
+    if (top_negative["Correlation"] < 0).sum() >= 4:
         negative_note = None
     else:
-        top_negative = corr_series.sort_values().head(4)
         negative_note = (
             "No strong negative correlations were observed. "
             "This is common in cryptocurrency markets due to shared "
@@ -116,16 +171,14 @@ def render():
     with col1:
         st.markdown("### Top Positive Correlations")
         st.dataframe(
-            top_positive.reset_index()
-            .rename(columns={"index": "Coin", selected_coin: "Correlation"}),
+            top_positive.rename(columns={"Related_Coin": "Coin"}),
             use_container_width=True
         )
 
     with col2:
         st.markdown("### Negative / Least Correlated Coins")
         st.dataframe(
-            top_negative.reset_index()
-            .rename(columns={"index": "Coin", selected_coin: "Correlation"}),
+            top_negative.rename(columns={"Related_Coin": "Coin"}),
             use_container_width=True
         )
 
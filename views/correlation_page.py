@@ -2,26 +2,68 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 
-
-@st.cache_data
-def load_data():
-    df = pd.read_csv("dataset/main_crypto_dataset.csv")
-    df["Date"] = pd.to_datetime(df["Date"])
-    return df
+from services.correlation_stack import ROLLING_WINDOWS
+from services.data_store import (
+    get_correlation_engine,
+    get_neighbor_index,
+    get_rolling_corr_stack,
+)
+from services.neighbors import column_neighbors
 
 
 def render():
     st.title(" Cryptocurrency Correlation Analysis")
 
-    df = load_data()
-
-   
-    returns_df = (
-        df.pivot(index="Date", columns="Symbol", values="Daily_Return")
-        .dropna()
+    corr_mode = st.radio(
+        "Correlation Window",
+        ["All History", "Rolling Window", "Exponentially Weighted"],
+        horizontal=True,
+        key="corr_mode_select"
     )
 
-    corr_matrix = returns_df.corr()
+    engine = None
+    pairwise = False
+
+    if corr_mode == "Rolling Window":
+        window = st.select_slider(
+            "Window (days)", options=list(ROLLING_WINDOWS), value=90,
+            key="corr_window_slider"
+        )
+        end_dates, symbols, stack = get_rolling_corr_stack(window)
+        if not len(end_dates):
+            st.info(f"Not enough history for a {window}-day window.")
+            return
+
+        end_date = st.slider(
+            "Window End Date",
+            min_value=end_dates[0].date(),
+            max_value=end_dates[-1].date(),
+            value=end_dates[-1].date(),
+            format="YYYY-MM-DD",
+            key=f"corr_window_end_{window}"
+        )
+        # Scrubbing is a slice of the precomputed stack, not a recompute.
+        t = end_dates.searchsorted(pd.Timestamp(end_date), side="right") - 1
+        st.caption(f"{end_dates[t] - pd.Timedelta(days=window - 1):%Y-%m-%d} to {end_dates[t]:%Y-%m-%d}")
+
+        corr_matrix = pd.DataFrame(stack[t], index=symbols, columns=symbols)
+    elif corr_mode == "Exponentially Weighted":
+        halflife = st.slider(
+            "Half-life (days)", min_value=5, max_value=180, value=30, step=5,
+            key="corr_halflife_slider"
+        )
+        engine = get_correlation_engine(halflife=halflife)
+    else:
+        pairwise = st.checkbox(
+            "Use each pair's full overlapping history",
+            value=True,
+            help="Otherwise only days on which every coin has a return are used.",
+            key="corr_pairwise_check"
+        )
+        engine = get_correlation_engine(pairwise=pairwise)
+
+    if engine is not None:
+        corr_matrix = engine.matrix()
 
  
     st.subheader("Correlation Heatmap (All Cryptocurrencies)")
@@ -51,44 +93,40 @@ def render():
         key="corr_coin_select"
     )
 
-    coin_corr = (
-        corr_matrix[selected_coin]
-        .drop(selected_coin)
-        .sort_values(ascending=False)
-    )
+    # The full-history pairwise view reads the persisted top-k index; the
+    # windowed modes rank the one engine column they already have.
+    if corr_mode == "All History" and pairwise:
+        neighbors = get_neighbor_index().neighbors(selected_coin)
+    elif engine is None:
+        neighbors = column_neighbors(
+            corr_matrix[selected_coin].drop(selected_coin)
+        )
+    else:
+        neighbors = column_neighbors(
+            engine.column(selected_coin).drop(selected_coin)
+        )
+
+    neighbors = {
+        kind: table.rename(columns={"Related_Coin": "Coin B"})
+        for kind, table in neighbors.items()
+    }
 
     
-    top_positive = (
-        coin_corr.head(4)
-        .reset_index()
-        .rename(columns={"index": "Coin B", selected_coin: "Correlation"})
-    )
+    top_positive = neighbors["positive"]
 
     st.markdown("### 🔵 Top Positively Correlated Coins")
     st.dataframe(top_positive, use_container_width=True)
 
   
-    negative_corr = coin_corr[coin_corr < 0]
-
-    if len(negative_corr) >= 1:
-        top_negative = (
-            negative_corr.sort_values()
-            .head(4)
-            .reset_index()
-            .rename(columns={"index": "Coin B", selected_coin: "Correlation"})
-        )
+    top_negative = neighbors["negative"]
+    top_negative = top_negative[top_negative["Correlation"] < 0]
 
+    if len(top_negative) >= 1:
         st.markdown("### 🔴 Top Negatively Correlated Coins")
         st.dataframe(top_negative, use_container_width=True)
 
     else:
-        least_corr = (
-            coin_corr.abs()
-            .sort_values()
-            .head(4)
-            .reset_index()
-            .rename(columns={"index": "Coin B", selected_coin: "Correlation"})
-        )
+        least_corr = neighbors["least"]
 
         st.markdown("### 🟡 Least Correlated Coins")
         st.info(
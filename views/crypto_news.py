@@ -1,9 +1,16 @@
 import streamlit as st
-import feedparser
-from datetime import datetime
+from datetime import datetime, timezone
 import re
 import html
 
+from services.news_store import configured_feeds, read_entries, start_ingester
+
+
+@st.cache_resource
+def news_ingester():
+    """One background ingester per app process, started on first view."""
+    return start_ingester(configured_feeds())
+
 def clean_html(text):
     if not text:
         return ""
@@ -17,34 +24,42 @@ def render():
     st.set_page_config(page_title="Crypto News", layout="wide")
     st.title("Crypto News & Market Updates")
 
-    RSS_URL = "https://news.google.com/rss/search?q=cryptocurrency"
-
-    feed = feedparser.parse(RSS_URL)
-
-    if not feed.entries:
-        st.error("Unable to load cryptocurrency news at the moment.")
+    # Feeds are fetched on a background thread; the page only reads the
+    # local store, so a slow or unreachable feed never blocks a rerun.
+    if not news_ingester().is_alive():
+        news_ingester.clear()
+        news_ingester()
+    entries, feeds = read_entries(limit=8)
+
+    if not entries:
+        errors = [feed["error"] for feed in feeds if feed["error"]]
+        if errors:
+            st.error(f"Unable to load cryptocurrency news at the moment. ({errors[0]})")
+        else:
+            st.info("Fetching the latest news in the background. Refresh in a moment.")
         return
 
     st.subheader("Latest Cryptocurrency Market News")
 
-    shown = 0
+    last_fetch = max(feed["fetched_at"] for feed in feeds)
+    st.caption(
+        "Updated "
+        + datetime.fromtimestamp(last_fetch, timezone.utc).strftime("%d %b %Y, %H:%M UTC")
+    )
 
-    for entry in feed.entries:
+    for entry in entries:
 
         title = clean_html(entry.get("title", ""))
         summary_raw = entry.get("summary", "")
         summary = clean_html(summary_raw)
-        published = entry.get("published", "")
+        published = entry.get("published")
 
         st.markdown("---")
         st.markdown(f"### {title}")
 
         if published:
-            try:
-                dt = datetime(*entry.published_parsed[:6])
-                st.caption(dt.strftime("%d %b %Y, %H:%M"))
-            except Exception:
-                st.caption(published)
+            dt = datetime.fromtimestamp(published, timezone.utc)
+            st.caption(dt.strftime("%d %b %Y, %H:%M"))
 
         if summary:
             sentences = summary.split(".")
@@ -53,10 +68,6 @@ def render():
         else:
             st.write("Summary not available.")
 
-        shown += 1
-        if shown >= 8:
-            break
-
     st.subheader("Why This Matters")
 
     st.markdown("""
@@ -3,18 +3,22 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 
+from services.data_store import get_coin, get_symbols
+from services.streaming_stats import StreamingStats
+
+
+@st.cache_resource
+def load_return_stats(coin):
+    return StreamingStats(get_coin(coin)["Daily_Return"].to_numpy())
+
 
 def render():
     st.title(" Exploratory Data Analysis (EDA)")
 
    
-    df = pd.read_csv("dataset/main_crypto_dataset.csv")
-    df["Date"] = pd.to_datetime(df["Date"])
-
-   
     coin = st.selectbox(
         "Select Cryptocurrency",
-        sorted(df["Symbol"].unique()),
+        get_symbols(),
         key="eda_coin_select"
     )
 
@@ -33,7 +37,7 @@ def render():
         key="eda_type_select"
     )
 
-    coin_df = df[df["Symbol"] == coin].sort_values("Date")
+    coin_df = get_coin(coin)
 
     
     range_selector = dict(
@@ -53,7 +57,7 @@ def render():
     if eda_type == "Price Over Time":
         fig = px.line(
             coin_df,
-            x="Date",
+            x=coin_df.index,
             y="Close",
             title=f"{coin} – Price Over Time"
         )
@@ -75,20 +79,20 @@ def render():
         fig = go.Figure()
 
         fig.add_trace(go.Scatter(
-            x=coin_df["Date"],
+            x=coin_df.index,
             y=coin_df["Close"],
             name="Close Price"
         ))
 
         fig.add_trace(go.Scatter(
-            x=coin_df["Date"],
+            x=coin_df.index,
             y=coin_df["SMA_7"],
             name="SMA 7",
             line=dict(dash="dot")
         ))
 
         fig.add_trace(go.Scatter(
-            x=coin_df["Date"],
+            x=coin_df.index,
             y=coin_df["SMA_14"],
             name="SMA 14",
             line=dict(dash="dot")
@@ -131,19 +135,23 @@ def render():
         st.plotly_chart(fig, use_container_width=True)
 
     elif eda_type == "Volatility Analysis":
-        fig = go.Figure()
+        windows = st.multiselect(
+            "Rolling Windows (days)",
+            list(range(2, 366)),
+            default=[7, 14],
+            key="eda_volatility_windows"
+        )
 
-        fig.add_trace(go.Scatter(
-            x=coin_df["Date"],
-            y=coin_df["Volatility_7"],
-            name="Volatility 7D"
-        ))
+        stats = load_return_stats(coin)
 
-        fig.add_trace(go.Scatter(
-            x=coin_df["Date"],
-            y=coin_df["Volatility_14"],
-            name="Volatility 14D"
-        ))
+        fig = go.Figure()
+
+        for window in sorted(windows):
+            fig.add_trace(go.Scatter(
+                x=coin_df.index,
+                y=stats.rolling.std_series(window),
+                name=f"Volatility {window}D"
+            ))
 
         fig.update_layout(
             title=f"{coin} – Rolling Volatility",
@@ -162,7 +170,7 @@ def render():
     elif eda_type == "Volume Analysis":
         fig = px.bar(
             coin_df,
-            x="Date",
+            x=coin_df.index,
             y="Volume",
             title=f"{coin} – Trading Volume"
         )
@@ -184,6 +192,13 @@ def render():
         st.subheader(f"{coin} – Summary Statistics")
         st.dataframe(coin_df.describe())
 
+        st.subheader(f"{coin} – Daily Return Distribution")
+        st.dataframe(
+            pd.Series(load_return_stats(coin).summary(), name="Daily_Return")
+            .to_frame()
+        )
+        st.caption("Quantiles are streaming P² estimates.")
+
     elif eda_type == "Missing Values":
         st.subheader(f"{coin} – Missing Values")
         missing = coin_df.isna().sum().reset_index()
@@ -1,9 +1,14 @@
 import os
-import pandas as pd
 import streamlit as st
 import plotly.graph_objects as go
 import numpy as np
 
+from services.csv_cache import read_csv_cached
+from services.data_store import get_coin, get_forecast, get_forecast_intervals, get_symbols
+from services.forecasting import MODELS
+from services.intervals import COVERAGES, apply_intervals
+from services.signals import turning_points
+
 
 def render():
 
@@ -11,32 +16,45 @@ def render():
     st.title("Cryptocurrency Price Forecasting")
 
     BASE_DIR = "dataset"
-    MODELS_DIR = os.path.join(BASE_DIR, "models")
 
-    DATASET_PATH = os.path.join(BASE_DIR, "main_crypto_dataset.csv")
     REP_PATH = os.path.join(BASE_DIR, "cluster_representatives.csv")
+    METRICS_PATH = os.path.join(BASE_DIR, "models", "model_comparison_metrics.csv")
 
-    main_df = pd.read_csv(DATASET_PATH)
-    main_df["Date"] = pd.to_datetime(main_df["Date"])
-
-    rep_df = pd.read_csv(REP_PATH)
-    coin_list = rep_df["Selected_Coin"].tolist()
+    rep_df = read_csv_cached(REP_PATH)
+    coin_list = get_symbols()
+    default_coin = rep_df["Selected_Coin"].iloc[0]
 
-    col1, col2, col3 = st.columns(3)
+    col1, col2, col3, col4 = st.columns(4)
 
     with col1:
-        selected_coin = st.selectbox("Select Coin", coin_list)
+        selected_coin = st.selectbox(
+            "Select Coin",
+            coin_list,
+            index=coin_list.index(default_coin) if default_coin in coin_list else 0,
+            key="forecast_coin_select"
+        )
 
     with col2:
         selected_model = st.selectbox(
             "Select Model",
-            ["ARIMA", "LSTM", "Random Forest", "XGBoost", "Prophet"]
+            list(MODELS),
+            key="forecast_model_select"
         )
 
     with col3:
         horizon_label = st.selectbox(
             "Select Forecast Horizon",
-            ["1 Day", "7 Days", "1 Month", "3 Months"]
+            ["1 Day", "7 Days", "1 Month", "3 Months"],
+            key="forecast_horizon_select"
+        )
+
+    with col4:
+        coverage = st.selectbox(
+            "Interval Coverage",
+            COVERAGES,
+            index=COVERAGES.index(0.8),
+            format_func=lambda c: f"{c:.0%}",
+            key="forecast_coverage_select"
         )
 
     horizon_days = {
@@ -46,43 +64,46 @@ def render():
         "3 Months": 90
     }[horizon_label]
 
-    model_prefix = {
-        "ARIMA": "arima",
-        "LSTM": "lstm",
-        "Random Forest": "rf",
-        "XGBoost": "xgb",
-        "Prophet": "prophet"
-    }[selected_model]
+    model_prefix = MODELS[selected_model]
 
-    if "Symbol" in main_df.columns:
-        coin_actual = main_df[main_df["Symbol"] == selected_coin].sort_values("Date").copy()
-    else:
-        coin_actual = main_df.sort_values("Date").copy()
+    coin_actual = get_coin(selected_coin)
 
-    last_hist_date = coin_actual["Date"].max()
+    last_hist_date = coin_actual.index.max()
 
-    pred_df = pd.read_csv(
-        os.path.join(MODELS_DIR, f"{model_prefix}_{selected_coin}_predicted.csv")
-    )
-    pred_df["Date"] = pd.to_datetime(pred_df["Date"])
+    try:
+        with st.spinner(f"Preparing {selected_model} forecast for {selected_coin}..."):
+            pred_df, forecast_df = get_forecast(selected_coin, model_prefix)
+    except ImportError as exc:
+        st.error(
+            f"{selected_model} forecasts need the `{exc.name}` package, "
+            "which is not installed."
+        )
+        return
 
-    forecast_df = pd.read_csv(
-        os.path.join(MODELS_DIR, f"{model_prefix}_{selected_coin}_3_month_forecast.csv")
-    )
-    forecast_df["Date"] = pd.to_datetime(forecast_df["Date"])
     forecast_df = forecast_df.iloc[:horizon_days]
 
-    eval_df = pd.merge(
-        coin_actual[["Date", "Close"]],
-        pred_df[["Date", "Predicted_Close"]],
-        on="Date",
-        how="inner"
-    )
-
-    residuals = eval_df["Close"] - eval_df["Predicted_Close"]
-    error_std = residuals.std()
+    # Prefer the out-of-sample error from the walk-forward backtest; the
+    # in-sample fit flatters every model.
+    mape = None
+    if os.path.exists(METRICS_PATH):
+        metrics_df = read_csv_cached(METRICS_PATH)
+        if "MAPE" in metrics_df.columns:
+            backtest = metrics_df.loc[
+                (metrics_df["Model"] == selected_model)
+                & (metrics_df["Coin"] == selected_coin),
+                "MAPE"
+            ].dropna()
+            if not backtest.empty:
+                mape = backtest.iloc[0]
+
+    if mape is None:
+        eval_df = coin_actual[["Close"]].join(
+            pred_df.set_index("Date")["Predicted_Close"],
+            how="inner"
+        )
+        residuals = eval_df["Close"] - eval_df["Predicted_Close"]
+        mape = np.mean(np.abs(residuals / eval_df["Close"])) * 100
 
-    mape = np.mean(np.abs(residuals / eval_df["Close"])) * 100
     confidence = max(0, 100 - mape)
 
     confidence_label = "High" if confidence >= 85 else "Medium" if confidence >= 70 else "Low"
@@ -98,25 +119,23 @@ def render():
     forecast_values = forecast_df.iloc[:, 1].values
     forecast_dates = forecast_df["Date"].values
 
-    upper_band = forecast_values + error_std
-    lower_band = forecast_values - error_std
-
-    buy_dates, buy_prices = [], []
-    sell_dates, sell_prices = [], []
+    quantiles = get_forecast_intervals(selected_coin, model_prefix)
+    if quantiles is None:
+        st.warning(
+            f"No held-out residuals for {selected_model} on {selected_coin}, so no "
+            "interval band is shown. Run `python -m pipelines.backtest_models` "
+            "to compute them."
+        )
 
-    for i in range(1, len(forecast_values) - 1):
-        if forecast_values[i] < forecast_values[i - 1] and forecast_values[i] < forecast_values[i + 1]:
-            buy_dates.append(forecast_dates[i])
-            buy_prices.append(forecast_values[i])
+    minima, maxima = turning_points(forecast_values)
 
-        if forecast_values[i] > forecast_values[i - 1] and forecast_values[i] > forecast_values[i + 1]:
-            sell_dates.append(forecast_dates[i])
-            sell_prices.append(forecast_values[i])
+    buy_dates, buy_prices = forecast_dates[minima], forecast_values[minima]
+    sell_dates, sell_prices = forecast_dates[maxima], forecast_values[maxima]
 
     fig = go.Figure()
 
     fig.add_trace(go.Scatter(
-        x=coin_actual["Date"],
+        x=coin_actual.index,
         y=coin_actual["Close"],
         mode="lines",
         name="Actual Price",
@@ -140,23 +159,26 @@ def render():
         marker=dict(size=8)
     ))
 
-    fig.add_trace(go.Scatter(
-        x=forecast_df["Date"],
-        y=upper_band,
-        mode="lines",
-        line=dict(color="rgba(239,68,68,0.3)"),
-        showlegend=False
-    ))
-
-    fig.add_trace(go.Scatter(
-        x=forecast_df["Date"],
-        y=lower_band,
-        mode="lines",
-        fill="tonexty",
-        fillcolor="rgba(239,68,68,0.18)",
-        line=dict(color="rgba(239,68,68,0.3)"),
-        name="Confidence Interval"
-    ))
+    if quantiles is not None:
+        lower_band, upper_band = apply_intervals(forecast_values, quantiles, coverage)
+
+        fig.add_trace(go.Scatter(
+            x=forecast_df["Date"],
+            y=upper_band,
+            mode="lines",
+            line=dict(color="rgba(239,68,68,0.3)"),
+            showlegend=False
+        ))
+
+        fig.add_trace(go.Scatter(
+            x=forecast_df["Date"],
+            y=lower_band,
+            mode="lines",
+            fill="tonexty",
+            fillcolor="rgba(239,68,68,0.18)",
+            line=dict(color="rgba(239,68,68,0.3)"),
+            name=f"{coverage:.0%} Interval"
+        ))
 
     fig.add_trace(go.Scatter(
         x=buy_dates,
@@ -188,7 +210,7 @@ def render():
             showgrid=True,
             gridcolor="rgba(255,255,255,0.08)",
             zeroline=False,
-            range=[coin_actual["Date"].min(), last_hist_date],
+            range=[coin_actual.index.min(), last_hist_date],
             rangeselector=dict(
                 buttons=[
                     dict(count=1, label="1D", step="day", stepmode="backward"),
@@ -220,5 +242,12 @@ def render():
 
     st.plotly_chart(fig, use_container_width=True)
 
+    if quantiles is not None:
+        st.caption(
+            "Bands are horizon-dependent conformal intervals from walk-forward "
+            "backtest residuals: the h-day band uses the spread of h-day "
+            "cumulative errors."
+        )
+
     st.subheader("Forecast Values")
     st.dataframe(forecast_df.reset_index(drop=True))
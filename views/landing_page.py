@@ -1,18 +1,10 @@
 import streamlit as st
-import pandas as pd
 import plotly.graph_objects as go
 
-def render():
+from services.data_store import get_coin, get_crossover_signals, get_symbols
 
-    
-    @st.cache_data
-    def load_data():
-        return pd.read_csv(
-            "dataset/main_crypto_dataset.csv",
-            parse_dates=["Date"]
-        ).sort_values("Date")
+def render():
 
-    df = load_data()
 
     st.title(" Cryptocurrency Analytics Dashboard")
     st.markdown(
@@ -23,28 +15,24 @@ def render():
 
     coin = st.selectbox(
         "Select Cryptocurrency",
-        sorted(df["Symbol"].unique())
+        get_symbols(),
+        key="landing_coin_select"
     )
 
-    coin_df = df[df["Symbol"] == coin].copy()
+    coin_df = get_coin(coin)
 
    
-    coin_df["Buy_Signal"] = (
-        (coin_df["Close"] > coin_df["SMA_14"]) &
-        (coin_df["Close"].shift(1) <= coin_df["SMA_14"].shift(1))
-    )
+    buy_signals, sell_signals = get_crossover_signals("Close", "SMA_14")
 
-    coin_df["Sell_Signal"] = (
-        (coin_df["Close"] < coin_df["SMA_14"]) &
-        (coin_df["Close"].shift(1) >= coin_df["SMA_14"].shift(1))
-    )
+    coin_df["Buy_Signal"] = buy_signals[coin].reindex(coin_df.index, fill_value=False)
+    coin_df["Sell_Signal"] = sell_signals[coin].reindex(coin_df.index, fill_value=False)
 
     plot_df = coin_df.dropna(
         subset=["SMA_7", "SMA_14", "EMA_7", "EMA_14"]
     )
 
-    x_min = plot_df["Date"].min()
-    x_max = plot_df["Date"].max()
+    x_min = plot_df.index.min()
+    x_max = plot_df.index.max()
 
   
     range_selector = dict(
@@ -64,7 +52,7 @@ def render():
  
     price_fig = go.Figure()
     price_fig.add_trace(go.Scatter(
-        x=plot_df["Date"],
+        x=plot_df.index,
         y=plot_df["Close"],
         mode="lines",
         name="Close Price"
@@ -91,14 +79,14 @@ def render():
     
     ma_fig = go.Figure()
 
-    ma_fig.add_trace(go.Scatter(x=plot_df["Date"], y=plot_df["Close"], name="Close"))
-    ma_fig.add_trace(go.Scatter(x=plot_df["Date"], y=plot_df["SMA_7"], name="SMA 7"))
-    ma_fig.add_trace(go.Scatter(x=plot_df["Date"], y=plot_df["SMA_14"], name="SMA 14"))
+    ma_fig.add_trace(go.Scatter(x=plot_df.index, y=plot_df["Close"], name="Close"))
+    ma_fig.add_trace(go.Scatter(x=plot_df.index, y=plot_df["SMA_7"], name="SMA 7"))
+    ma_fig.add_trace(go.Scatter(x=plot_df.index, y=plot_df["SMA_14"], name="SMA 14"))
     ma_fig.add_trace(go.Scatter(
-        x=plot_df["Date"], y=plot_df["EMA_7"], name="EMA 7", line=dict(dash="dot")
+        x=plot_df.index, y=plot_df["EMA_7"], name="EMA 7", line=dict(dash="dot")
     ))
     ma_fig.add_trace(go.Scatter(
-        x=plot_df["Date"], y=plot_df["EMA_14"], name="EMA 14", line=dict(dash="dot")
+        x=plot_df.index, y=plot_df["EMA_14"], name="EMA 14", line=dict(dash="dot")
     ))
 
     ma_fig.update_layout(
@@ -123,7 +111,7 @@ def render():
     signal_fig = go.Figure()
 
     signal_fig.add_trace(go.Candlestick(
-        x=plot_df["Date"],
+        x=plot_df.index,
         open=plot_df["Open"],
         high=plot_df["High"],
         low=plot_df["Low"],
@@ -132,7 +120,7 @@ def render():
     ))
 
     signal_fig.add_trace(go.Scatter(
-        x=plot_df.loc[plot_df["Buy_Signal"], "Date"],
+        x=plot_df.index[plot_df["Buy_Signal"]],
         y=plot_df.loc[plot_df["Buy_Signal"], "Close"],
         mode="markers",
         name="Buy",
@@ -140,7 +128,7 @@ def render():
     ))
 
     signal_fig.add_trace(go.Scatter(
-        x=plot_df.loc[plot_df["Sell_Signal"], "Date"],
+        x=plot_df.index[plot_df["Sell_Signal"]],
         y=plot_df.loc[plot_df["Sell_Signal"], "Close"],
         mode="markers",
         name="Sell",
@@ -168,7 +156,7 @@ def render():
     
     volume_fig = go.Figure()
     volume_fig.add_trace(go.Bar(
-        x=plot_df["Date"],
+        x=plot_df.index,
         y=plot_df["Volume"],
         name="Volume"
     ))
@@ -1,9 +1,11 @@
 
 
 import os
-import pandas as pd
+import plotly.express as px
 import streamlit as st
 
+from services.csv_cache import read_csv_cached
+
 def render():
 
     st.set_page_config(page_title="Model Comparison", layout="wide")
@@ -21,6 +23,10 @@ def render():
         MODELS_DIR, "model_qualitative_analysis.csv"
     )
 
+    FOLDS_PATH = os.path.join(
+        MODELS_DIR, "model_backtest_folds.csv"
+    )
+
     if not os.path.exists(METRICS_PATH):
         st.error(f"Missing file: {METRICS_PATH}")
         st.stop()
@@ -29,15 +35,16 @@ def render():
         st.error(f"Missing file: {QUALITATIVE_PATH}")
         st.stop()
 
-    metrics_df = pd.read_csv(METRICS_PATH)
-    qualitative_df = pd.read_csv(QUALITATIVE_PATH)
+    metrics_df = read_csv_cached(METRICS_PATH)
+    qualitative_df = read_csv_cached(QUALITATIVE_PATH)
 
   
     coin_list = sorted(metrics_df["Coin"].unique())
 
     selected_coin = st.selectbox(
         "Select Cryptocurrency",
-        coin_list
+        coin_list,
+        key="comparison_coin_select"
     )
 
     coin_metrics = metrics_df[
@@ -54,13 +61,16 @@ def render():
  
     st.subheader(f"Model Performance Comparison — {selected_coin}")
 
+    metric_columns = [
+        col for col in ["MAE", "RMSE", "MAPE", "Direction_Accuracy", "Folds"]
+        if col in comparison_df.columns
+    ]
+
     st.dataframe(
         comparison_df[
-            [
-                "Model",
-                "MAE",
-                "RMSE",
-                "Direction_Accuracy",
+            ["Model"]
+            + metric_columns
+            + [
                 "Pros",
                 "Cons",
                 "Trading_Suitability",
@@ -70,6 +80,30 @@ def render():
         use_container_width=True,
     )
 
+    if os.path.exists(FOLDS_PATH):
+        folds_df = read_csv_cached(FOLDS_PATH, parse_dates=["Test_Start", "Test_End"])
+        coin_folds = folds_df[folds_df["Coin"] == selected_coin]
+
+        if not coin_folds.empty:
+            st.subheader("Walk-Forward Error by Fold")
+
+            fold_metric = st.radio(
+                "Metric",
+                ["MAPE", "MAE", "RMSE", "Direction_Accuracy"],
+                horizontal=True,
+                key="comparison_fold_metric"
+            )
+
+            fig_folds = px.line(
+                coin_folds,
+                x="Test_Start",
+                y=fold_metric,
+                color="Model",
+                markers=True,
+                title=f"Out-of-sample {fold_metric} per fold — {selected_coin}"
+            )
+            st.plotly_chart(fig_folds, use_container_width=True)
+
 
     st.subheader("Key Observations")
 
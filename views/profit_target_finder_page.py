@@ -1,9 +1,17 @@
 
 
 import os
+
+import numpy as np
 import pandas as pd
+import plotly.graph_objects as go
 import streamlit as st
 
+from services.csv_cache import read_csv_cached
+from services.data_store import get_returns_matrix
+from services.portfolio import efficient_frontier, horizon_covariance, min_risk_weights
+from services.position_sizing import load_rules, round_to_lots, size_orders
+
 
 def render():
 
@@ -19,7 +27,7 @@ def render():
         st.error("Missing file: profit_target_inputs.csv")
         st.stop()
 
-    df = pd.read_csv(DATA_PATH)
+    df = read_csv_cached(DATA_PATH)
 
     
     col1, col2, col3 = st.columns(3)
@@ -51,32 +59,40 @@ def render():
         )
 
     
-    df = df[df["Horizon_Days"] == horizon_days].copy()
-
-   
-    df["Units_Affordable"] = (capital / df["Current_Price"]).astype(int)
-    df["Max_Possible_Profit"] = (
-        df["Units_Affordable"] * df["Expected_Profit_per_Unit"]
+    # Size an order for every coin, model and horizon at once: fractional
+    # units rounded down to the coin's lot size, the minimum order value,
+    # and tiered fees on both the buy and the sell.
+    prices = df.groupby("Coin")["Current_Price"].median()
+    rules = load_rules(prices.index, prices.to_numpy())
+    sized = size_orders(
+        capital,
+        df["Current_Price"].to_numpy(),
+        df["Forecast_Price"].to_numpy(),
+        df["Coin"].map(rules["Lot_Size"]).to_numpy(),
+        df["Coin"].map(rules["Min_Notional"]).to_numpy(),
     )
+    df = pd.concat([df.reset_index(drop=True), sized], axis=1)
+    df["Lot_Size"] = df["Coin"].map(rules["Lot_Size"])
+    df["Units_Affordable"] = df["Units"]
+    df["Max_Possible_Profit"] = df["Net_Profit"].round(2)
 
-    df["Meets_Target"] = df["Max_Possible_Profit"] >= target_profit
+    df = df[df["Horizon_Days"] == horizon_days].copy()
+    inputs_df = df.copy()
 
-    
-    def confidence_label(ret):
-        if ret >= 15:
-            return "High"
-        elif ret >= 7:
-            return "Medium"
-        else:
-            return "Low"
+    df["Meets_Target"] = df["Placeable"] & (df["Max_Possible_Profit"] >= target_profit)
 
-    df["Confidence"] = df["Expected_Return_Pct"].apply(confidence_label)
+    df["Confidence"] = np.select(
+        [df["Expected_Return_Pct"] >= 15, df["Expected_Return_Pct"] >= 7],
+        ["High", "Medium"],
+        default="Low"
+    )
 
     
     feasible_df = df[df["Meets_Target"]].copy()
 
     if feasible_df.empty:
         st.warning("⚠ No coin can meet the target profit under current constraints.")
+        render_portfolio(inputs_df, target_profit, capital, horizon_days)
         return
 
    
@@ -94,7 +110,10 @@ def render():
         "Current_Price",
         "Forecast_Price",
         "Expected_Return_Pct",
+        "Lot_Size",
         "Units_Affordable",
+        "Notional",
+        "Fees",
         "Max_Possible_Profit",
         "Confidence"
     ]
@@ -116,8 +135,9 @@ def render():
         **Model:** {best['Model']}  
         **Buy Price:** £{best['Current_Price']}  
         **Forecast Price:** £{best['Forecast_Price']}  
-        **Units:** {best['Units_Affordable']}  
-        **Expected Profit:** £{round(best['Max_Possible_Profit'], 2)}  
+        **Units:** {best['Units_Affordable']:,.8g} (lot size {best['Lot_Size']:g})  
+        **Order Value:** £{best['Notional']:,.2f} (round-trip fees £{best['Fees']:,.2f} at {best['Fee_Rate_%']:.2f}% per side)  
+        **Expected Profit (after fees):** £{round(best['Max_Possible_Profit'], 2)}  
         **Confidence:** **{best['Confidence']}**
         """
     )
@@ -127,3 +147,101 @@ def render():
         "This tool converts forecasts into profit-driven decisions, "
         "supporting realistic capital constraints and scenario-based evaluation as required in AE2."
     )
+
+    render_portfolio(inputs_df, target_profit, capital, horizon_days)
+
+
+def render_portfolio(inputs_df, target_profit, capital, horizon_days):
+    st.markdown("---")
+    st.subheader("Portfolio Allocation")
+    st.caption(
+        "Splits the capital across coins so the expected profit reaches the "
+        "target with the smallest possible variance, using the covariance of "
+        "daily returns over the last year. Capital that is not needed stays in cash."
+    )
+
+    model = st.selectbox(
+        "Forecast used for expected returns",
+        ["Average of all models"] + sorted(inputs_df["Model"].unique()),
+        key="portfolio_model_select"
+    )
+
+    if model != "Average of all models":
+        inputs_df = inputs_df[inputs_df["Model"] == model]
+    expected = inputs_df.groupby("Coin")[["Current_Price", "Expected_Return_Pct"]].mean()
+
+    returns = get_returns_matrix("Daily_Return")
+    expected = expected[expected.index.isin(returns.columns)]
+    if expected.empty:
+        st.info("No forecasts are available for this horizon.")
+        return
+
+    coins = expected.index.tolist()
+    mu = expected["Expected_Return_Pct"].to_numpy() / 100
+    cov = horizon_covariance(returns[coins], horizon_days)
+
+    weights = min_risk_weights(mu, cov, target_profit / capital)
+    if weights is None:
+        st.warning(
+            f"Even the best coin's expected return ({mu.max() * 100:.2f}%) cannot "
+            f"reach £{target_profit:,.2f} with £{capital:,.2f}."
+        )
+        return
+
+    allocation = capital * weights
+    lot_size = load_rules(coins, expected["Current_Price"].to_numpy())["Lot_Size"].to_numpy()
+    risk_share = weights * (cov @ weights)
+    variance = weights @ cov @ weights
+    pnl_std = capital * np.sqrt(variance)
+
+    table = pd.DataFrame({
+        "Coin": coins,
+        "Weight_%": (weights * 100).round(2),
+        "Allocation_£": allocation.round(2),
+        "Units": round_to_lots(allocation / expected["Current_Price"].to_numpy(), lot_size),
+        "Expected_Return_Pct": (mu * 100).round(2),
+        "Expected_Profit_£": (allocation * mu).round(2),
+        "Risk_Share_%": (risk_share / variance * 100 if variance > 0 else risk_share * 0).round(1),
+    })
+    table = table[table["Weight_%"] > 0].sort_values("Weight_%", ascending=False)
+
+    # The single-coin route the ranking above suggests, for comparison.
+    single_std = capital * (target_profit / capital) / mu * np.sqrt(np.diag(cov))
+    single_std = np.where(mu * capital >= target_profit, single_std, np.inf)
+
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("Capital Deployed", f"£{allocation.sum():,.2f}")
+    m2.metric("Expected Profit", f"£{capital * weights @ mu:,.2f}")
+    m3.metric("P&L Std. Deviation", f"£{pnl_std:,.2f}")
+    if np.isfinite(single_std.min()) and single_std.min() > 0:
+        change = round((pnl_std / single_std.min() - 1) * 100, 1) + 0.0
+        m4.metric("Risk vs Best Single Coin", f"{change:+.1f}%")
+
+    st.dataframe(table.reset_index(drop=True), use_container_width=True)
+
+    targets, frontier = efficient_frontier(mu, cov)
+    frontier_fig = go.Figure()
+    frontier_fig.add_trace(go.Scatter(
+        x=capital * np.sqrt(np.einsum("ij,jk,ik->i", frontier, cov, frontier)),
+        y=capital * targets,
+        mode="lines",
+        name="Least-risk frontier",
+    ))
+    frontier_fig.add_trace(go.Scatter(
+        x=capital * np.sqrt(np.diag(cov)),
+        y=capital * mu,
+        mode="markers+text",
+        text=coins,
+        textposition="top center",
+        name="All-in single coin",
+    ))
+    frontier_fig.add_trace(go.Scatter(
+        x=[pnl_std], y=[target_profit], mode="markers",
+        marker=dict(size=14, symbol="star"), name="Chosen allocation",
+    ))
+    frontier_fig.update_layout(
+        height=450,
+        xaxis_title="P&L Standard Deviation (£)",
+        yaxis_title="Expected Profit (£)",
+    )
+    st.plotly_chart(frontier_fig, use_container_width=True)
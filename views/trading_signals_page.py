@@ -1,8 +1,13 @@
 import os
-import pandas as pd
+import plotly.express as px
 import streamlit as st
 from datetime import datetime, timedelta
 
+from services.csv_cache import read_csv_cached
+from services.data_store import get_backtest_horizon, get_signal_replay
+from services.signal_backtest import equity_curves, simulate
+from services.trading_signals import classify
+
 def render():
 
     st.set_page_config(page_title="Trading Signals", layout="wide")
@@ -16,7 +21,7 @@ def render():
         st.error(f"Missing file: {SIGNALS_PATH}")
         st.stop()
 
-    signals_df = pd.read_csv(SIGNALS_PATH)
+    signals_df = read_csv_cached(SIGNALS_PATH)
 
     col1, col2 = st.columns(2)
 
@@ -30,7 +35,7 @@ def render():
     with col2:
         selected_horizon = st.selectbox(
             "Select Horizon",
-            ["7D", "14D", "30D"],
+            sorted(signals_df["Horizon"].unique(), key=lambda h: int(h[:-1])),
             key="trading_horizon_select"
         )
 
@@ -47,42 +52,21 @@ def render():
     buy_date = datetime.today().date()
     sell_date = buy_date + timedelta(days=horizon_days)
 
-    def confidence_level(row):
-        ret = abs(row["Expected_Return_%"])
-        if ret >= 8:
-            return "High"
-        elif ret >= 4:
-            return "Medium"
-        else:
-            return "Low"
-
-    def risk_level(row):
-        ret = abs(row["Expected_Return_%"])
-        if ret >= 10:
-            return "High Risk"
-        elif ret >= 5:
-            return "Medium Risk"
-        else:
-            return "Low Risk"
-
-    filtered_df["Confidence"] = filtered_df.apply(confidence_level, axis=1)
-    filtered_df["Risk_Level"] = filtered_df.apply(risk_level, axis=1)
-
-    def signal_color(signal):
-        if signal == "BUY":
-            return "🟢 BUY"
-        elif signal == "SELL":
-            return "🔴 SELL"
-        else:
-            return "⚪ HOLD"
+    # Tables written before the signal engine carry no buckets.
+    if "Confidence" not in filtered_df or "Risk_Level" not in filtered_df:
+        filtered_df["Confidence"], filtered_df["Risk_Level"] = classify(
+            filtered_df["Expected_Return_%"]
+        )
 
-    filtered_df["Signal_Display"] = filtered_df["Signal"].apply(signal_color)
+    filtered_df["Signal_Display"] = filtered_df["Signal"].map(
+        {"BUY": "🟢 BUY", "SELL": "🔴 SELL"}
+    ).fillna("⚪ HOLD")
 
     st.subheader(
         f"Generated Trading Signals — {selected_coin} ({selected_horizon})"
     )
 
-    for _, row in filtered_df.iterrows():
+    for row in filtered_df.to_dict("records"):
 
         st.markdown("---")
         col1, col2, col3, col4 = st.columns(4)
@@ -131,6 +115,8 @@ def render():
         else:
             st.success("Low volatility – suitable for conservative investors.")
 
+    render_signal_backtest(selected_coin, horizon_days)
+
     st.subheader("How Signals Are Generated")
 
     st.markdown("""
@@ -144,3 +130,68 @@ def render():
 
 This page provides **risk-aware, time-based trading decisions**, fulfilling AE2 decision-support requirements.
 """)
+
+
+def render_signal_backtest(coin, horizon_days):
+    st.subheader(f"Signal Backtest — {coin} ({horizon_days}D)")
+
+    covered = get_backtest_horizon()
+    if covered is None:
+        st.info(
+            "No historical forecasts to replay yet. Run "
+            "`python -m pipelines.backtest_models` to record them."
+        )
+        return
+    if horizon_days > covered:
+        st.info(
+            f"The backtest forecasts only cover {covered} days. Rerun "
+            f"`python -m pipelines.backtest_models --horizon {horizon_days}` "
+            f"to replay {horizon_days}D signals."
+        )
+        return
+
+    replay = get_signal_replay(horizon_days)
+    if replay is None:
+        st.info("The backtest recorded no decisions to replay at this horizon.")
+        return
+
+    positions, returns = replay
+    series = positions.columns.get_level_values("Coin") == coin
+    if not series.any():
+        st.info(f"The walk-forward backtest does not cover {coin}.")
+        return
+    positions, returns = positions.loc[:, series], returns.loc[:, series]
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        fee = st.number_input(
+            "Fee per trade (%)", 0.0, 5.0, 0.1, 0.05, key="trading_bt_fee"
+        ) / 100
+    with col2:
+        slippage = st.number_input(
+            "Slippage (%)", 0.0, 5.0, 0.05, 0.05, key="trading_bt_slippage"
+        ) / 100
+    with col3:
+        size = st.slider(
+            "Position size (% of equity)", 5, 100, 100, 5, key="trading_bt_size"
+        ) / 100
+
+    equity, _ = equity_curves(positions, returns, fee, slippage, size)
+    equity.columns = equity.columns.get_level_values("Model")
+    fig = px.line(
+        equity, labels={"value": "Equity (start = 1)", "variable": "Model"},
+        title="Equity from acting on each model's past BUY signals",
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    metrics = simulate(positions, returns, fee, slippage, size)
+    st.dataframe(
+        metrics.drop(columns=["Fee", "Slippage", "Size", "Coin"]).set_index("Model"),
+        use_container_width=True,
+    )
+    st.caption(
+        "Each fold of the walk-forward backtest gives one decision, made from "
+        "the model's ex-ante forecast at that time. BUY holds the coin for the "
+        "horizon, SELL and HOLD stay in cash; fee and slippage are charged on "
+        "every entry and exit."
+    )
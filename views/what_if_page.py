@@ -1,9 +1,43 @@
 
 
 import os
-import pandas as pd
+
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
 import streamlit as st
 
+from services.data_store import DATA_PATH, get_coin, get_symbols
+from services.monte_carlo import risk_summary, simulate_prices
+from services.scenarios import break_even_surface, net_profit, scenario_grid
+
+SIMULATION_METHODS = {"Geometric Brownian motion": "gbm", "Block bootstrap": "bootstrap"}
+
+
+# Grids reach ~72 MB, so only the current and previous settings are kept.
+@st.cache_resource(max_entries=2)
+def build_grid(current_price, buy_range, sell_range, price_steps, quantity_range,
+               quantity_steps, fee_range, fee_steps):
+    """Axes and net-profit array of one scenario grid; reruns that only
+    change the displayed slice reuse it."""
+    buys = current_price * np.linspace(*buy_range, price_steps) / 100
+    sells = current_price * np.linspace(*sell_range, price_steps) / 100
+    quantities = np.linspace(*quantity_range, quantity_steps)
+    fees = np.linspace(*fee_range, fee_steps)
+    return buys, sells, quantities, fees, scenario_grid(buys, sells, quantities, fees)
+
+
+@st.cache_resource(max_entries=4, show_spinner="Simulating price paths...")
+def simulate_coin(coin, method, horizon, n_paths, lookback, block):
+    """(terminal, highest) simulated prices from the coin's recent log returns."""
+    coin_df = get_coin(coin)
+    log_returns = coin_df["Log_Return"].to_numpy()
+    if lookback:
+        log_returns = log_returns[-lookback:]
+    return simulate_prices(
+        log_returns, float(coin_df["Close"].iloc[-1]), horizon, n_paths, method, block
+    )
+
 
 def render():
 
@@ -11,33 +45,37 @@ def render():
     st.title("What-If Analysis & Scenario Simulation")
 
   
-    BASE_DIR = "dataset"
-    DATASET_PATH = os.path.join(BASE_DIR, "main_crypto_dataset.csv")
-
-  
-    if not os.path.exists(DATASET_PATH):
-        st.error(f"Missing file: {DATASET_PATH}")
+    if not os.path.exists(DATA_PATH):
+        st.error(f"Missing file: {DATA_PATH}")
         st.stop()
 
-    df = pd.read_csv(DATASET_PATH)
-    df["Date"] = pd.to_datetime(df["Date"])
-
   
     selected_coin = st.selectbox(
         "Select Cryptocurrency",
-        sorted(df["Symbol"].unique()),
+        get_symbols(),
         key="whatif_coin_select"
     )
 
-    coin_df = (
-        df[df["Symbol"] == selected_coin]
-        .sort_values("Date")
-    )
+    coin_df = get_coin(selected_coin)
 
     current_price = coin_df["Close"].iloc[-1]
 
     st.info(f"Latest Market Price: £{current_price:.2f}")
 
+    mode = st.radio(
+        "Analysis mode",
+        ["Two scenarios", "Scenario grid", "Monte Carlo"],
+        horizontal=True,
+        key="whatif_mode"
+    )
+
+    if mode == "Scenario grid":
+        render_scenario_grid(current_price)
+        return
+    if mode == "Monte Carlo":
+        render_monte_carlo(selected_coin, current_price)
+        return
+
    
     st.subheader("Scenario Inputs")
 
@@ -108,20 +146,10 @@ def render():
     )
 
 
-    def calculate_profit(buy, sell, qty, fees):
-        gross = (sell - buy) * qty
-        fee_cost = (buy * qty) * (fees / 100)
-        net = gross - fee_cost
-        pct = (net / (buy * qty)) * 100
-        return round(net, 2), round(pct, 2)
-
-    profit_a, pct_a = calculate_profit(
-        buy_price, sell_price_a, quantity, fees_pct
-    )
-
-    profit_b, pct_b = calculate_profit(
-        buy_price, sell_price_b, quantity, fees_pct
+    profit, pct = net_profit(
+        buy_price, np.array([sell_price_a, sell_price_b]), quantity, fees_pct
     )
+    (profit_a, profit_b), (pct_a, pct_b) = profit.round(2), pct.round(2)
 
     
     st.subheader("Scenario Comparison")
@@ -159,3 +187,183 @@ def render():
 
 This satisfies AE2’s **mandatory What-If Analysis requirement**.
 """)
+
+
+def render_scenario_grid(current_price):
+    st.subheader("Scenario Grid")
+    st.caption(
+        "Every combination of buy price, sell price, quantity and fee level is "
+        "evaluated in one pass. Prices are set as a percentage of the latest price."
+    )
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        buy_range = st.slider(
+            "Buy price range (% of latest)", 10, 300, (80, 120),
+            key="whatif_grid_buy_range"
+        )
+        sell_range = st.slider(
+            "Sell price range (% of latest)", 10, 300, (80, 150),
+            key="whatif_grid_sell_range"
+        )
+        price_steps = st.select_slider(
+            "Price steps per axis", [25, 50, 100, 200, 300], value=100,
+            key="whatif_grid_price_steps"
+        )
+
+    with col2:
+        quantity_min = st.number_input(
+            "Minimum quantity", min_value=0.0001, value=1.0,
+            key="whatif_grid_qty_min"
+        )
+        quantity_max = st.number_input(
+            "Maximum quantity", min_value=0.0001, value=100.0,
+            key="whatif_grid_qty_max"
+        )
+        quantity_steps = st.slider(
+            "Quantity levels", 1, 20, 10, key="whatif_grid_qty_steps"
+        )
+
+    with col3:
+        fee_range = st.slider(
+            "Fee range (%)", 0.0, 5.0, (0.0, 1.0), 0.05,
+            key="whatif_grid_fee_range"
+        )
+        fee_steps = st.slider(
+            "Fee levels", 1, 10, 5, key="whatif_grid_fee_steps"
+        )
+
+    buys, sells, quantities, fees, net = build_grid(
+        float(current_price), buy_range, sell_range, price_steps,
+        (quantity_min, max(quantity_min, quantity_max)), quantity_steps,
+        fee_range, fee_steps,
+    )
+
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("Scenarios Evaluated", f"{net.size:,}")
+    m2.metric("Profitable", f"{(net > 0).mean() * 100:.1f}%")
+    m3.metric("Best Net Profit (£)", f"£{net.max():,.2f}")
+    m4.metric("Worst Net Profit (£)", f"£{net.min():,.2f}")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        quantity = st.select_slider(
+            "Quantity shown", quantities.tolist(), value=quantities[-1],
+            format_func=lambda q: f"{q:,.4g}", key="whatif_grid_qty_shown"
+        )
+    with col2:
+        fee = st.select_slider(
+            "Fee shown (%)", fees.tolist(), value=fees[0],
+            format_func=lambda f: f"{f:.2f}", key="whatif_grid_fee_shown"
+        )
+
+    grid_slice = net[:, :, np.searchsorted(quantities, quantity), np.searchsorted(fees, fee)]
+    heatmap_fig = px.imshow(
+        grid_slice,
+        x=sells,
+        y=buys,
+        origin="lower",
+        aspect="auto",
+        color_continuous_scale="RdYlGn",
+        color_continuous_midpoint=0,
+        labels={"x": "Sell Price (£)", "y": "Buy Price (£)", "color": "Net Profit (£)"},
+    )
+    heatmap_fig.update_layout(height=550, title="Net Profit by Buy and Sell Price")
+    st.plotly_chart(heatmap_fig, use_container_width=True)
+
+    surface_fig = go.Figure(go.Surface(
+        z=break_even_surface(buys, fees), x=fees, y=buys, colorscale="Viridis"
+    ))
+    surface_fig.update_layout(
+        height=550,
+        title="Break-even Sell Price",
+        scene=dict(
+            xaxis_title="Fee (%)", yaxis_title="Buy Price (£)", zaxis_title="Sell Price (£)"
+        ),
+    )
+    st.plotly_chart(surface_fig, use_container_width=True)
+    st.caption(
+        "Selling above the surface is profitable for any quantity; the "
+        "break-even price does not depend on how many units are traded."
+    )
+
+
+def render_monte_carlo(coin, current_price):
+    st.subheader("Monte Carlo Simulation")
+    st.caption(
+        "Simulates many possible price paths from the coin's historical daily "
+        "log returns and reports the resulting profit and loss distribution."
+    )
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        method = st.radio(
+            "Simulation method", list(SIMULATION_METHODS), key="whatif_mc_method"
+        )
+        lookback = st.select_slider(
+            "History used (days)", [90, 180, 365, 730, "All"], value=365,
+            key="whatif_mc_lookback"
+        )
+
+    with col2:
+        horizon = st.slider(
+            "Holding period (days)", 1, 365, 30, key="whatif_mc_horizon"
+        )
+        n_paths = st.select_slider(
+            "Simulated paths", [10_000, 50_000, 100_000, 250_000, 500_000, 1_000_000],
+            value=100_000, format_func=lambda n: f"{n:,}", key="whatif_mc_paths"
+        )
+
+    with col3:
+        quantity = st.number_input(
+            "Quantity", min_value=0.0001, value=10.0, key="whatif_mc_quantity"
+        )
+        fees_pct = st.number_input(
+            "Transaction Fees (%)", min_value=0.0, max_value=5.0, value=0.5,
+            step=0.1, key="whatif_mc_fees"
+        )
+
+    target_price = st.number_input(
+        "Target Sell Price (£)", min_value=0.0, value=float(current_price * 1.2),
+        format="%.6g", key="whatif_mc_target"
+    )
+
+    terminal, peak = simulate_coin(
+        coin, SIMULATION_METHODS[method], horizon, n_paths,
+        None if lookback == "All" else lookback, 10,
+    )
+    risk = risk_summary(terminal, peak, current_price, quantity, fees_pct, target_price)
+
+    m1, m2, m3 = st.columns(3)
+    m1.metric("Expected P&L (£)", f"£{risk['Expected_PnL']:,.2f}")
+    m2.metric("Probability of Profit", f"{risk['Prob_Profit'] * 100:.1f}%")
+    m3.metric("Probability of Hitting Target", f"{risk['Prob_Hit_Target'] * 100:.1f}%")
+
+    m4, m5, m6 = st.columns(3)
+    m4.metric("Median P&L (£)", f"£{risk['Median_PnL']:,.2f}")
+    m5.metric("95% VaR (£)", f"£{risk['VaR']:,.2f}")
+    m6.metric("95% CVaR (£)", f"£{risk['CVaR']:,.2f}")
+
+    # Bin on the server so the chart stays light for any number of paths.
+    counts, edges = np.histogram(risk["pnl"], bins=100)
+    centres = (edges[:-1] + edges[1:]) / 2
+    hist_fig = px.bar(
+        x=centres, y=counts / counts.sum() * 100,
+        color=np.where(centres >= 0, "Profit", "Loss"),
+        color_discrete_map={"Profit": "seagreen", "Loss": "indianred"},
+        labels={"x": "Net P&L at Horizon (£)", "y": "Share of Paths (%)", "color": ""},
+    )
+    hist_fig.update_traces(width=edges[1] - edges[0])
+    hist_fig.add_vline(x=-risk["VaR"], line_dash="dash", annotation_text="95% VaR")
+    hist_fig.update_layout(height=450, bargap=0, title="Distribution of Net P&L")
+    st.plotly_chart(hist_fig, use_container_width=True)
+
+    st.caption(
+        f"Buying {quantity:,.4g} units at £{current_price:,.6g} and holding for "
+        f"{horizon} days. VaR is the loss not exceeded on 95% of paths; CVaR is the "
+        "average loss on the remaining 5%. The target counts as hit if a path "
+        f"touches it at any point ({risk['Prob_Above_Target_At_End'] * 100:.1f}% "
+        "of paths end above it)."
+    )